@@ -1,5 +1,14 @@
 # Data structures used by open addressing hash map and separate chaining for collision resolution
 
+import weakref
+from array import array
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import partial
+from numbers import Complex, Integral, Number
+from operator import index
+
+
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
 class DynamicArrayException(Exception):
@@ -73,23 +82,516 @@ class DynamicArray:
         """Return length of array."""
         return len(self._data)
 
+    def copy(self) -> "DynamicArray":
+        """Return a new array holding the same elements (a shallow copy)."""
+        return DynamicArray(self._data)
+
+
+class BucketArray(DynamicArray):
+    """
+    Dynamic Array used for the bucket arrays of the HashMaps. Storage for length elements
+    is allocated at once, filled with fill, as a list or, given a typecode, as an array.array
+    whose memory can be exported without copying through memoryview(). Supports the
+    DynamicArray methods plus slicing and bulk fill. view() returns the underlying storage,
+    which the HashMaps index directly in their hot loops, skipping the bounds checks.
+    While frozen views of the array exist, the methods save every element they overwrite
+    for the views, and the array cannot change length.
+    """
+
+    def __init__(self, length: int = 0, fill: object = None, typecode: str = None) -> None:
+        """
+        Initialize new bucket array of length elements, all set to fill. Fill defaults to None,
+        or to 0 given a typecode.
+        """
+        if typecode is None:
+            self._data = [fill] * length
+        else:
+            self._data = array(typecode, [0 if fill is None else fill]) * length
+        self._views = []                # weak references to the saved elements of each frozen view
+
+    def __getitem__(self, index):
+        """Return the element at index, or a new BucketArray for a slice."""
+        if isinstance(index, slice):
+            result = BucketArray.__new__(BucketArray)
+            result._data = self._data[index]
+            result._views = []
+            return result
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        return self._data[index]
+
+    def __setitem__(self, index, value: object) -> None:
+        """
+        Set the element at index, or the elements of a slice to those of an iterable. While frozen
+        views exist, the iterable must hold as many elements as the slice.
+        """
+        if isinstance(index, slice):
+            if isinstance(value, DynamicArray):
+                value = value._data
+            if self._views:
+                value = list(value)
+                indices = range(*index.indices(len(self._data)))
+                if len(value) != len(indices):
+                    self._check_resizable()
+                for position in indices:
+                    self.preserve(position)
+            self._data[index] = value if isinstance(self._data, list) else array(self.typecode, value)
+            return
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self.preserve(index)
+        self._data[index] = value
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        return self._data[index]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """Set value of element at a given index."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self.preserve(index)
+        self._data[index] = value
+
+    def append(self, value: object) -> None:
+        """Add new element at the end of the array."""
+        self._check_resizable()
+        self._data.append(value)
+
+    def pop(self):
+        """Remove element from end of the array and return it."""
+        self._check_resizable()
+        return self._data.pop()
+
+    def swap(self, i: int, j: int) -> None:
+        """Swap two elements in array given their indices."""
+        self.preserve(i)
+        self.preserve(j)
+        self._data[i], self._data[j] = self._data[j], self._data[i]
+
+    def _check_resizable(self) -> None:
+        """Raise ValueError if frozen views share the storage, which must then keep its length."""
+        self._views = [reference for reference in self._views if reference() is not None]
+        if self._views:
+            raise ValueError("a bucket array cannot change length while frozen views of it exist")
+
+    @property
+    def typecode(self) -> str:
+        """Typecode of the array.array storage, or None for list storage."""
+        return getattr(self._data, 'typecode', None)
+
+    def fill(self, value: object, start: int = 0, stop: int = None) -> None:
+        """Set every element from start up to stop (the end by default) to value."""
+        stop = len(self._data) if stop is None else stop
+        if start < stop:
+            self[start:stop] = [value] * (stop - start)
+
+    def view(self):
+        """
+        Return the underlying list or array.array itself, for trusted callers that keep their
+        indices within range. It stays valid until the array is replaced, not just written to.
+        """
+        return self._data
+
+    def memoryview(self) -> memoryview:
+        """Return a memoryview of array.array storage, sharing its memory."""
+        if self.typecode is None:
+            raise TypeError("only bucket arrays created with a typecode export a buffer")
+        return memoryview(self._data)
+
+    def copy(self) -> "BucketArray":
+        """Return a new bucket array holding the same elements (a shallow copy)."""
+        result = BucketArray.__new__(BucketArray)
+        result._data = self._data[:]
+        result._views = []
+        return result
+
+    def frozen(self) -> "FrozenBucketArray":
+        """
+        Return a read-only view of the current elements in constant time. The view keeps showing
+        them while this array changes: the methods save what they overwrite for it, and writes
+        to the storage returned by view() must be preceded by preserve(index).
+        """
+        saved = _SavedElements()
+        self._views.append(weakref.ref(saved))
+        return FrozenBucketArray(self._data, saved)
+
+    def preserve(self, index: int) -> bool:
+        """
+        Save the element at index for every frozen view that has not saved it yet, before it is
+        overwritten. Returns True if a view saved it, in which case the element object is still
+        seen by that view and must be replaced by a copy rather than changed in place.
+        """
+        if not self._views:
+            return False
+        element = self._data[index]
+        shared = dropped = False
+        for reference in self._views:
+            saved = reference()
+            if saved is None:
+                dropped = True                  # the view was garbage collected
+            elif index not in saved:
+                saved[index] = element
+                shared = True
+        if dropped:
+            self._views = [reference for reference in self._views if reference() is not None]
+        return shared
+
+
+class _SavedElements(dict):
+    """Elements of a BucketArray saved for one frozen view, by index, before they were overwritten"""
+
+    __slots__ = ('__weakref__',)
+
+
+class FrozenBucketArray(BucketArray):
+    """
+    Read-only view of a BucketArray as it was when frozen() was called. It shares the storage
+    of the array; elements the array overwrote since are read from the copies it saved first.
+    Reads stay consistent while another thread writes the array, since the array saves an
+    element before overwriting it and the view reads the storage before the saved copies.
+    """
+
+    def __init__(self, data, saved: _SavedElements) -> None:
+        """Initialize a view of the storage of a bucket array and the elements saved for it."""
+        self._data = data
+        self._saved = saved
+        self._views = []
+
+    def __getitem__(self, index):
+        """Return the element at index, or a new BucketArray for a slice."""
+        if isinstance(index, slice):
+            return self.copy()[index]
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        element = self._data[index]
+        return self._saved.get(index, element)
+
+    def __iter__(self):
+        """Iterate over the elements, so that view() can be used like the storage of a BucketArray."""
+        saved = self._saved
+        for index, element in enumerate(self._data):
+            yield saved.get(index, element)
+
+    def __len__(self) -> int:
+        """Return number of elements."""
+        return len(self._data)
+
+    def __setitem__(self, index, value: object) -> None:
+        raise TypeError("frozen bucket arrays are read-only")
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index."""
+        return self[index]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        raise TypeError("frozen bucket arrays are read-only")
+
+    def fill(self, value: object, start: int = 0, stop: int = None) -> None:
+        raise TypeError("frozen bucket arrays are read-only")
+
+    def view(self) -> "FrozenBucketArray":
+        """Return the view itself, which reads like the storage of a BucketArray."""
+        return self
+
+    def memoryview(self) -> memoryview:
+        """Return a memoryview of a copy of the elements."""
+        return self.copy().memoryview()
+
+    def copy(self) -> BucketArray:
+        """Return a new, writable bucket array holding the elements of the view."""
+        result = BucketArray.__new__(BucketArray)
+        result._data = self._data[:]
+        # the storage is copied before the saved elements, which the array saves before writing
+        for index, element in list(self._saved.items()):
+            result._data[index] = element
+        result._views = []
+        return result
+
+    def frozen(self) -> "FrozenBucketArray":
+        """Return the view itself, it never changes."""
+        return self
+
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN_64 = 0x9E3779B97F4A7C15
+
+
+def hash_int(key: int) -> int:
+    """Mix the bits of an integer key into a 64 bit hash (Fibonacci hashing)"""
+    key = (key * _GOLDEN_64) & _MASK_64
+    return key ^ (key >> 29)
+
+
+def _byte_view(key) -> memoryview:
+    """Return the bytes of a bytes, bytearray or memoryview key without copying them"""
+    return memoryview(key).cast('B')
+
+
+def _integral(key: object) -> int:
+    """
+    Return key as an int if it is a number equal to an integer that is not an int itself (NumPy
+    integers, floats such as 3.0, Decimal(5), 5 + 0j), or None otherwise. Equal keys must hash
+    alike, so these keys hash like the int they equal.
+    """
+    if isinstance(key, Integral):
+        return index(key)
+    if not isinstance(key, Number):
+        return None
+    try:
+        number = int(key.real if isinstance(key, Complex) else key)
+    except (TypeError, ValueError, OverflowError):     # not convertible, NaN or infinite
+        return None
+    return number if key == number else None
 
-def hash_function_1(key: str) -> int:
-    """Sample Hash function #1 to be used with HashMap implementation"""
-    hash = 0
-    for letter in key:
-        hash += ord(letter)
-    return hash
 
+def _compared_fields(key: object) -> tuple:
+    """
+    Return the values of the fields of a dataclass key that its equality compares. Fields declared
+    with compare=False may differ between equal keys, so they must not be hashed.
+    """
+    return tuple(getattr(key, field.name) for field in fields(key) if field.compare)
 
-def hash_function_2(key: str) -> int:
-    """Sample Hash function #2 to be used with HashMap implementation"""
-    hash, index = 0, 0
-    index = 0
-    for letter in key:
-        hash += (index + 1) * ord(letter)
-        index += 1
-    return hash
+
+def _hash_key(key: object, function) -> int:
+    """
+    Hash a key that is not a string, integer or bytes-like object. Numbers equal to an integer
+    hash like that integer, since the two compare equal. Tuples, frozen dataclasses and enum
+    members combine the hashes of their items (of their compared fields for dataclasses, of their
+    class and name for enum members) computed with function, and frozensets those of their
+    elements in any order. Any other key, a number not equal to an integer included, falls back
+    to the built in hash, which raises TypeError for unhashable keys.
+    """
+    number = _integral(key)
+    if number is not None:
+        return function(number)
+    if isinstance(key, frozenset):
+        # a sum of mixed element hashes does not depend on the iteration order of the set
+        combined = len(key)
+        for item in key:
+            combined = (combined + _fmix64(function(item) & _MASK_64)) & _MASK_64
+        return combined
+    if isinstance(key, tuple):
+        items = key
+    elif isinstance(key, Enum):
+        items = (type(key).__qualname__, key.name)
+    elif (is_dataclass(key) and not isinstance(key, type)
+          and key.__dataclass_params__.frozen):
+        items = (type(key).__qualname__,) + _compared_fields(key)
+    else:
+        return hash(key)
+
+    combined = 0x345678
+    for item in items:
+        combined = ((combined ^ function(item)) * 1000003) & _MASK_64
+    return combined
+
+
+def hash_function_1(key: object) -> int:
+    """
+    Sample Hash function #1 to be used with HashMap implementation
+    Integers hash to themselves and bytes-like keys to the sum of their bytes.
+    """
+    if isinstance(key, str):
+        hash = 0
+        for letter in key:
+            hash += ord(letter)
+        return hash
+    if isinstance(key, int):
+        return key
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return sum(_byte_view(key))
+    return _hash_key(key, hash_function_1)
+
+
+def hash_function_2(key: object) -> int:
+    """
+    Sample Hash function #2 to be used with HashMap implementation
+    Integers are mixed with hash_int and bytes-like keys weight each byte by its position.
+    """
+    if isinstance(key, str):
+        hash, index = 0, 0
+        index = 0
+        for letter in key:
+            hash += (index + 1) * ord(letter)
+            index += 1
+        return hash
+    if isinstance(key, int):
+        return hash_int(key)
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        hash = 0
+        for index, byte in enumerate(_byte_view(key), 1):
+            hash += index * byte
+        return hash
+    return _hash_key(key, hash_function_2)
+
+
+def _fmix64(hash: int) -> int:
+    """Finalize a 64 bit hash so every input bit affects every output bit (MurmurHash3 fmix64)"""
+    hash ^= hash >> 33
+    hash = (hash * 0xFF51AFD7ED558CCD) & _MASK_64
+    hash ^= hash >> 33
+    hash = (hash * 0xC4CEB9FE1A85EC53) & _MASK_64
+    return hash ^ (hash >> 33)
+
+
+def seeded_hash(key: object, seed: int) -> int:
+    """
+    Keyed 64 bit hash of key under seed. Strings and bytes-like keys are hashed from their
+    contents (FNV-1a started from the seed), so keys that collide under one seed are unlikely
+    to collide under another. Integers, and numbers equal to an integer, are mixed with the seed.
+    Tuples, frozen dataclasses, enum members and frozensets are hashed from their items under
+    the seed. Other keys can only be hashed through the built in hash(), which the seed then
+    mixes: keys whose built in hashes differ are spread differently by every seed, but keys
+    sharing a built in hash collide under every seed.
+    """
+    seed &= _MASK_64
+    if not isinstance(key, (str, int)):
+        number = _integral(key)
+        key = key if number is None else number
+    if isinstance(key, str):
+        hash = seed ^ 0xCBF29CE484222325
+        for letter in key:
+            hash = ((hash ^ ord(letter)) * 0x100000001B3) & _MASK_64
+        return _fmix64(hash)
+    if isinstance(key, int):
+        return _fmix64((key & _MASK_64) ^ seed)
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        hash = seed ^ 0xCBF29CE484222325
+        for byte in _byte_view(key):
+            hash = ((hash ^ byte) * 0x100000001B3) & _MASK_64
+        return _fmix64(hash)
+    return _fmix64((_hash_key(key, lambda item: seeded_hash(item, seed)) & _MASK_64) ^ seed)
+
+
+def seeded_hash_function(seed: int):
+    """
+    Return a hash function computing seeded_hash under a fixed seed, for maps hashing with a
+    per-map secret instead of one of the sample functions
+    """
+    return partial(seeded_hash, seed=seed)
+
+
+def portable_key(key: object) -> bool:
+    """
+    Return True if the sample hash functions and seeded_hash hash key the same way in every
+    process. They read the contents of strings, numbers and bytes-like keys, and of tuples,
+    frozensets, enum members and frozen dataclasses made of such keys. Other keys fall back to the
+    built in hash(), which may differ between processes (randomized string hashing inside them,
+    or hashes taken from the object's address).
+    """
+    if isinstance(key, (str, int, float, complex, bytes, bytearray, memoryview)):
+        return True
+    if _integral(key) is not None or isinstance(key, Enum):
+        return True
+    if isinstance(key, (tuple, frozenset)):
+        return all(portable_key(item) for item in key)
+    if is_dataclass(key) and not isinstance(key, type) and key.__dataclass_params__.frozen:
+        return all(portable_key(item) for item in _compared_fields(key))
+    return False
+
+
+# ------------ For keys shared between HashMaps  ------------ #
+
+class KeyArena:
+    """
+    Shared store of interned string keys for the HashMaps. Equal strings put into any map using
+    the arena are stored as one canonical str object, so duplicated keys across maps, snapshots
+    and get_keys() results take memory once and usually compare equal by identity. The hash of
+    each interned key is cached per hash function, so repeated keys are hashed only once.
+    Keys of other types pass through unchanged and are not cached.
+
+    The arena holds its maps and hash functions weakly. The cache of a hash function goes away
+    with the function, once no map uses it (the old function of a reseeded map), and collect()
+    drops the keys no map using the arena holds any more. It runs on its own whenever the
+    number of interned keys has doubled since the last collection.
+    """
+
+    _MIN_COLLECT = 1024                 # interned keys below which the arena is never collected
+
+    def __init__(self) -> None:
+        """Initialize an empty arena."""
+        self._keys = {}                                 # key -> canonical key
+        self._hashes = weakref.WeakKeyDictionary()      # hash function -> {canonical key: hash}
+        self._static_hashes = {}                        # same, for functions without weak references
+        self._maps = weakref.WeakSet()                  # maps interning their keys here
+        self._collect_at = self._MIN_COLLECT
+
+    def __len__(self) -> int:
+        """Return number of interned keys"""
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if an equal key has been interned"""
+        return type(key) is str and key in self._keys
+
+    def register(self, hash_map) -> None:
+        """Record a map whose keys the arena must keep. Maps register themselves."""
+        self._maps.add(hash_map)
+
+    def intern(self, key: object) -> object:
+        """
+        Return the canonical object for a string key, interning it first if needed. Interning a
+        new key may collect the arena first.
+        """
+        if type(key) is not str:
+            return key
+        canonical = self._keys.get(key)
+        if canonical is None:
+            if len(self._keys) >= self._collect_at:
+                self.collect()
+            canonical = self._keys[key] = key
+        return canonical
+
+    def _cache(self, function) -> dict:
+        """Return the hash cache of function, creating it if needed."""
+        try:
+            hashes = self._hashes.get(function)
+            if hashes is None:
+                hashes = self._hashes[function] = {}
+        except TypeError:                               # builtins cannot be weakly referenced
+            hashes = self._static_hashes.setdefault(function, {})
+        return hashes
+
+    def hash(self, key: object, function) -> int:
+        """
+        Return function(key), cached for interned keys. Keys that were never interned are hashed
+        without being cached, so lookups of missing keys do not grow the arena.
+        """
+        if type(key) is not str or key not in self._keys:
+            return function(key)
+        hashes = self._cache(function)
+        hash = hashes.get(key)
+        if hash is None:
+            hash = hashes[key] = function(key)
+        return hash
+
+    def collect(self) -> None:
+        """
+        Drop the interned keys, and their cached hashes, that no registered map holds. Takes
+        time linear in the total size of the registered maps. Keys interned by hand, outside any
+        map, are dropped too.
+        """
+        keys = self._keys
+        live = {}
+        for hash_map in list(self._maps):
+            for key in hash_map:
+                if type(key) is str and key in keys:
+                    live[key] = keys[key]
+        self._keys = live
+        for hashes in list(self._hashes.values()) + list(self._static_hashes.values()):
+            for key in [key for key in hashes if key not in live]:
+                del hashes[key]
+        self._collect_at = max(self._MIN_COLLECT, 2 * len(live))
+
+    def clear(self) -> None:
+        """Drop every interned key and cached hash. Maps keep the key objects they hold."""
+        self._keys.clear()
+        self._hashes.clear()
+        self._static_hashes.clear()
+        self._collect_at = self._MIN_COLLECT
 
 
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
@@ -99,7 +601,7 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
+    def __init__(self, key: object, value: object, next: "SLNode" = None) -> None:
         """Initialize node given a key and value."""
         self.key = key
         self.value = value
@@ -110,6 +612,33 @@ class SLNode:
         return '(' + str(self.key) + ': ' + str(self.value) + ')'
 
 
+class KeyNode:
+    """
+    Singly Linked List node that stores only a key, for use in hash sets.
+    Its value reads as None and assignments to it are ignored.
+    """
+
+    __slots__ = ('key', 'next')
+
+    def __init__(self, key: object, value: object = None, next: "KeyNode" = None) -> None:
+        """Initialize node given a key; the value is not stored."""
+        self.key = key
+        self.next = next
+
+    @property
+    def value(self) -> None:
+        """Return None, key nodes hold no value."""
+        return None
+
+    @value.setter
+    def value(self, value: object) -> None:
+        """Ignore the value, key nodes hold no value."""
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return '(' + str(self.key) + ')'
+
+
 class LinkedListIterator:
     """
     Separate iterator class for LinkedList
@@ -164,12 +693,18 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: object, value: object) -> None:
         """Insert new node at front of the list."""
         self._head = SLNode(key, value, self._head)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node at front of the list."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def remove(self, key: object) -> bool:
         """
         Remove first node with matching key.
         Return True if removal was successful, False otherwise.
@@ -177,7 +712,7 @@ class LinkedList:
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if node.key is key or node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -188,11 +723,12 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
+    def contains(self, key: object) -> SLNode:
         """Return node with matching key, or None if no match"""
         node = self._head
-        while node:
-            if node.key == key:
+        while node is not None:
+            node_key = node.key
+            if node_key is key or node_key == key:
                 return node
             node = node.next
         return node
@@ -206,12 +742,64 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    def __init__(self, key: object, value: object, hash: int = None) -> None:
+        """Initialize an entry for use in a hash map, optionally caching the hash of its key."""
         self.key = key
         self.value = value
         self.is_tombstone = False
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+class KeyEntry:
+    """
+    Open addressing entry that stores only a key, for use in hash sets.
+    Its value reads as None and assignments to it are ignored.
+    """
+
+    __slots__ = ('key', 'is_tombstone', 'hash')
+
+    def __init__(self, key: object, value: object = None, hash: int = None) -> None:
+        """Initialize an entry given a key and optionally its hash; the value is not stored."""
+        self.key = key
+        self.is_tombstone = False
+        self.hash = hash
+
+    @property
+    def value(self) -> None:
+        """Return None, key entries hold no value."""
+        return None
+
+    @value.setter
+    def value(self, value: object) -> None:
+        """Ignore the value, key entries hold no value."""
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return f"K: {self.key} TS: {self.is_tombstone}"
+
+
+# ------------ For use in caches built on a HashMap  ------------ #
+
+class DLNode:
+    """
+    Doubly Linked List node for use in caches built on a hash map.
+    Uses __slots__ so each node carries no per-instance dictionary.
+    """
+
+    __slots__ = ('key', 'value', 'prev', 'next')
+
+    def __init__(self, key: object, value: object,
+                 prev: "DLNode" = None, next: "DLNode" = None) -> None:
+        """Initialize node given a key and value."""
+        self.key = key
+        self.value = value
+        self.prev = prev
+        self.next = next
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return '(' + str(self.key) + ': ' + str(self.value) + ')'
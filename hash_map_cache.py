@@ -0,0 +1,435 @@
+# Description: This program implements bounded caches on top of the HashMap implementations. A cache
+#              pairs either HashMap (separate chaining or open addressing) with an intrusive doubly
+#              linked list of DLNode entries: LRUCache keeps the list in recency order, and LFUCache
+#              groups entries into frequency buckets. Both support a maximum number of entries and/or
+#              a maximum number of bytes, an optional time to live for entries, an eviction callback
+#              and hit/miss/eviction counters. get, put and eviction are all O(1) on average.
+
+
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DLNode, hash_function_1, hash_function_2
+
+
+CacheStats = namedtuple('CacheStats', 'hits misses evictions expirations size')
+
+
+class CacheNode(DLNode):
+    """
+    Cache entry linked into the eviction order of a cache.
+    """
+
+    __slots__ = ('expires', 'weight', 'frequency')
+
+    def __init__(self, key: object, value: object, expires: float, weight: int) -> None:
+        """Initialize an entry given its key, value, expiry time and size in bytes."""
+        super().__init__(key, value)
+        self.expires = expires
+        self.weight = weight
+        self.frequency = None
+
+
+class FrequencyNode:
+    """
+    Node of the LFU frequency list. Holds a circular list of the entries
+    that have been used exactly count times, oldest entry last.
+    """
+
+    __slots__ = ('count', 'prev', 'next', 'entries')
+
+    def __init__(self, count: int) -> None:
+        """Initialize a frequency bucket with an empty entry list."""
+        self.count = count
+        self.prev = self.next = self
+        self.entries = DLNode(None, None)
+        self.entries.prev = self.entries.next = self.entries
+
+
+def _link_after(position: DLNode, node: DLNode) -> None:
+    """Link node into a circular list directly after position."""
+    node.prev = position
+    node.next = position.next
+    position.next.prev = node
+    position.next = node
+
+
+def _unlink(node: DLNode) -> None:
+    """Remove node from the circular list it is linked into."""
+    node.prev.next = node.next
+    node.next.prev = node.prev
+    node.prev = node.next = None
+
+
+def _default_sizeof(key: object, value: object) -> int:
+    """Default entry weight used by max_bytes: the shallow size of the key and the value."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class BoundedCache(ABC):
+    """
+    Base class of the bounded caches. Subclasses define the eviction order.
+    """
+
+    def __init__(self, function, max_entries: int = None, max_bytes: int = None,
+                 ttl: float = None, on_evict=None, engine=hash_map_sc.HashMap,
+                 capacity: int = None, sizeof=_default_sizeof, clock=time.monotonic) -> None:
+        """
+        Initialize a new cache storing its entries in a HashMap built by engine with the
+        given hash function. At least one of max_entries and max_bytes must be given. ttl is
+        the number of seconds an entry stays valid after it was last put, and on_evict is called
+        as on_evict(key, value) for every entry dropped by the size limits or by expiring.
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("a bounded cache needs max_entries and/or max_bytes")
+
+        if capacity is None:
+            capacity = max_entries if max_entries else 64
+        self._map = engine(capacity, function)
+        self._compact_tombstones = issubclass(engine, hash_map_oa.HashMap)
+        self._removals = 0                  # OA removals since the table was last rebuilt
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._on_evict = on_evict
+        self._sizeof = sizeof
+        self._clock = clock
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return (type(self).__name__ + ' ' + str(self.stats()))
+
+    def get_size(self) -> int:
+        """
+        Return number of entries in the cache
+        """
+        return self._map.get_size()
+
+    def get_bytes(self) -> int:
+        """
+        Return total weight of the entries in the cache
+        """
+        return self._bytes
+
+    def stats(self) -> CacheStats:
+        """
+        Return the hit, miss, eviction and expiration counters and the current size
+        """
+        return CacheStats(self._hits, self._misses, self._evictions,
+                          self._expirations, self._map.get_size())
+
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: object, default: object = None) -> object:
+        """
+        Method that returns the value stored for key and marks the entry as used. If the key
+        is not present or its entry has expired, the miss is counted and default is returned.
+        """
+        node = self._map.get(key)
+        if node is None:
+            self._misses += 1
+            return default
+        if node.expires is not None and node.expires <= self._clock():
+            self._expirations += 1
+            self._drop(node, True)
+            self._misses += 1
+            return default
+
+        self._hits += 1
+        self._touch(node)
+        return node.value
+
+    def put(self, key: object, value: object) -> None:
+        """
+        Method that stores value for key, replacing the value of an existing entry, and marks
+        the entry as used. Entries are evicted in eviction order to keep the cache within its limits.
+        """
+        expires = None if self._ttl is None else self._clock() + self._ttl
+        weight = self._sizeof(key, value) if self._max_bytes is not None else 0
+
+        node = self._map.get(key)
+        if node is not None:
+            self._bytes += weight - node.weight
+            node.value = value
+            node.expires = expires
+            node.weight = weight
+            self._touch(node)
+            self._evict(0)
+            return
+
+        # make room before linking the new entry, so it is never chosen as its own victim
+        self._evict(1, weight)
+        node = CacheNode(key, value, expires, weight)
+        self._map.put(key, node)
+        self._bytes += weight
+        self._link(node)
+        if self._map.table_load() > 1:
+            self._map.resize_table(self._map.get_capacity() * 2)
+
+        # an entry heavier than max_bytes on its own cannot be kept
+        self._evict(0)
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Method that determines if the cache holds an unexpired entry for key. Does not count
+        as a use of the entry and does not change the hit/miss counters.
+        """
+        node = self._map.get(key)
+        if node is None:
+            return False
+        return node.expires is None or node.expires > self._clock()
+
+    def remove(self, key: object) -> None:
+        """
+        Method that removes the entry for key, if present. The eviction callback is not called.
+        """
+        node = self._map.get(key)
+        if node is not None:
+            self._drop(node, False)
+
+    def expire(self) -> int:
+        """
+        Method that drops every expired entry and returns how many were dropped. Expired
+        entries are otherwise only noticed when they are looked up.
+        """
+        if self._ttl is None:
+            return 0
+        now = self._clock()
+        expired = [node for node in self._nodes() if node.expires <= now]
+        for node in expired:
+            self._expirations += 1
+            self._drop(node, True)
+        return len(expired)
+
+    def clear(self) -> None:
+        """
+        Method that removes every entry without calling the eviction callback. The counters are kept.
+        """
+        self._map.clear()
+        self._bytes = 0
+        self._removals = 0
+        self._reset_order()
+
+    def _evict(self, extra_entries: int, extra_bytes: int = 0) -> None:
+        """
+        Evict entries in eviction order until extra_entries more entries weighing extra_bytes
+        would fit within the limits of the cache.
+        """
+        while self._map.get_size() > 0 and (
+                (self._max_entries is not None
+                 and self._map.get_size() + extra_entries > self._max_entries)
+                or (self._max_bytes is not None
+                    and self._bytes + extra_bytes > self._max_bytes)):
+            self._evictions += 1
+            self._drop(self._victim(), True)
+
+    def _drop(self, node: CacheNode, notify: bool) -> None:
+        """
+        Remove an entry from the map and the eviction order, calling the eviction callback if asked.
+        """
+        self._map.remove(node.key)
+        self._unlink_entry(node)
+        self._bytes -= node.weight
+
+        # OA removals leave tombstones behind; rebuild the table before they crowd out empty buckets
+        if self._compact_tombstones:
+            self._removals += 1
+            if self._removals > self._map.get_capacity() // 4:
+                self._map.resize_table(self._map.get_capacity())
+                self._removals = 0
+
+        if notify and self._on_evict is not None:
+            self._on_evict(node.key, node.value)
+
+    # Eviction order hooks implemented by LRUCache and LFUCache
+
+    @abstractmethod
+    def _reset_order(self) -> None:
+        """Start an empty eviction order."""
+
+    @abstractmethod
+    def _link(self, node: CacheNode) -> None:
+        """Link a new entry into the eviction order."""
+
+    @abstractmethod
+    def _touch(self, node: CacheNode) -> None:
+        """Record a use of an entry in the eviction order."""
+
+    @abstractmethod
+    def _unlink_entry(self, node: CacheNode) -> None:
+        """Remove an entry from the eviction order."""
+
+    @abstractmethod
+    def _victim(self) -> CacheNode:
+        """Return the entry to evict next."""
+
+    @abstractmethod
+    def _nodes(self):
+        """Yield every entry in the eviction order."""
+
+
+class LRUCache(BoundedCache):
+    """
+    Bounded cache that evicts the least recently used entry first
+    """
+
+    def __init__(self, function, **kwargs) -> None:
+        """
+        Initialize a new LRU cache, see BoundedCache for the parameters
+        """
+        self._reset_order()
+        super().__init__(function, **kwargs)
+
+    def _reset_order(self) -> None:
+        """Start an empty recency list. The most recently used entry follows the sentinel."""
+        self._order = DLNode(None, None)
+        self._order.prev = self._order.next = self._order
+
+    def _link(self, node: CacheNode) -> None:
+        """Link a new entry as the most recently used one."""
+        _link_after(self._order, node)
+
+    def _touch(self, node: CacheNode) -> None:
+        """Move an entry to the most recently used position."""
+        _unlink(node)
+        _link_after(self._order, node)
+
+    def _unlink_entry(self, node: CacheNode) -> None:
+        """Remove an entry from the recency list."""
+        _unlink(node)
+
+    def _victim(self) -> CacheNode:
+        """Return the least recently used entry."""
+        return self._order.prev
+
+    def _nodes(self):
+        """Yield the entries from most to least recently used."""
+        node = self._order.next
+        while node is not self._order:
+            yield node
+            node = node.next
+
+
+class LFUCache(BoundedCache):
+    """
+    Bounded cache that evicts the least frequently used entry first,
+    breaking ties by evicting the least recently used of those entries
+    """
+
+    def __init__(self, function, **kwargs) -> None:
+        """
+        Initialize a new LFU cache, see BoundedCache for the parameters
+        """
+        self._reset_order()
+        super().__init__(function, **kwargs)
+
+    def _reset_order(self) -> None:
+        """Start an empty frequency list. Frequency buckets follow the sentinel in increasing order."""
+        self._frequencies = FrequencyNode(0)
+
+    def _link(self, node: CacheNode) -> None:
+        """Link a new entry into the bucket of entries used once."""
+        first = self._frequencies.next
+        if first.count != 1:
+            first = FrequencyNode(1)
+            _link_after(self._frequencies, first)
+        node.frequency = first
+        _link_after(first.entries, node)
+
+    def _touch(self, node: CacheNode) -> None:
+        """Move an entry to the bucket for one more use, creating that bucket if needed."""
+        current = node.frequency
+        following = current.next
+        if following.count != current.count + 1:
+            following = FrequencyNode(current.count + 1)
+            _link_after(current, following)
+
+        self._unlink_entry(node)
+        node.frequency = following
+        _link_after(following.entries, node)
+
+    def _unlink_entry(self, node: CacheNode) -> None:
+        """Remove an entry from its bucket, dropping the bucket once it is empty."""
+        bucket = node.frequency
+        _unlink(node)
+        node.frequency = None
+        if bucket.entries.next is bucket.entries:
+            _unlink(bucket)
+
+    def _victim(self) -> CacheNode:
+        """Return the oldest entry of the lowest frequency bucket."""
+        return self._frequencies.next.entries.prev
+
+    def _nodes(self):
+        """Yield the entries from the lowest to the highest frequency."""
+        bucket = self._frequencies.next
+        while bucket is not self._frequencies:
+            node = bucket.entries.next
+            while node is not bucket.entries:
+                following = node.next
+                yield node
+                node = following
+            bucket = bucket.next
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nLRU - eviction example 1")
+    print("------------------------")
+    evicted = []
+    c = LRUCache(hash_function_2, max_entries=3,
+                 on_evict=lambda key, value: evicted.append(key))
+    for i in range(5):
+        c.put('key' + str(i), i)
+        c.get('key0')
+    print(c.get('key0'), c.get('key1'), c.get('key4'), evicted)
+    print(c.stats())
+
+    print("\nLRU - open addressing engine example 1")
+    print("--------------------------------------")
+    c = LRUCache(hash_function_1, max_entries=50, engine=hash_map_oa.HashMap)
+    for i in range(1000):
+        c.put(str(i), i * 10)
+    result = all(c.get(str(i)) == i * 10 for i in range(950, 1000))
+    print(result, c.get('0'), c.get_size(), c.stats())
+
+    print("\nLFU - eviction example 1")
+    print("------------------------")
+    evicted = []
+    c = LFUCache(hash_function_2, max_entries=2,
+                 on_evict=lambda key, value: evicted.append(key))
+    c.put('a', 1)
+    c.put('b', 2)
+    c.get('a')
+    c.put('c', 3)
+    c.get('c')
+    c.put('d', 4)
+    print(c.get('a'), c.get('b'), c.get('c'), c.get('d'), evicted)
+    print(c.stats())
+
+    print("\nTTL and max_bytes example 1")
+    print("---------------------------")
+    now = [0.0]
+    c = LRUCache(hash_function_2, max_bytes=10, ttl=5, clock=lambda: now[0],
+                 sizeof=lambda key, value: len(value))
+    c.put('a', 'xxxx')
+    c.put('b', 'yyyy')
+    c.put('c', 'zzzz')
+    print(c.contains_key('a'), c.get_bytes(), c.get_size())
+    now[0] = 6.0
+    print(c.get('b'), c.expire(), c.get_size(), c.stats())
@@ -0,0 +1,455 @@
+# Description: This program is an implementation of a hash map that utilizes bucketized cuckoo hashing for
+#              collision resolution. Pairs are stored in two or more tables of buckets holding four slots
+#              each, plus a small stash. A key can only live in one bucket of each table, chosen by
+#              seeded_hash with an independent random seed per table, or in the stash, so get,
+#              contains_key and remove check a fixed number of slots no matter how full the map is.
+#              The hash function given to the map is kept for compatibility with the other HashMaps but
+#              not used for placement: cuckoo hashing needs independent functions, and keys colliding
+#              under a single function (anagrams under hash_function_1) would collide in every table.
+#              When every candidate slot of a new key is taken, put moves a random occupant to one of
+#              its other buckets, and so on; if that walk runs too long the homeless pair goes in the
+#              stash, and once the stash is full the tables are rebuilt with new seeds, growing them if
+#              rebuilding keeps failing. Keys no seed can separate (equal builtin hash() values of
+#              objects seeded_hash cannot read) would fail every rebuild, so after one round of growth
+#              the pairs still homeless overflow into the stash, which is searched linearly. Entries
+#              are never changed in place, so snapshot can share the tables with the map. The methods
+#              match the other HashMaps.
+
+
+import random
+
+from a6_include import (BucketArray, DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2, seeded_hash)
+
+
+class HashMap:
+    _SLOTS = 4                  # slots per bucket
+    _STASH = 4                  # pairs that may overflow the tables
+    _MAX_KICKS = 100            # displacements tried by one insertion before using the stash
+    _MAX_LOAD = 0.9             # load at which put grows the tables
+    _REHASH_ATTEMPTS = 3        # rebuilds with new seeds before the tables are grown
+    _REBUILD_LIMIT = 6          # rebuilds before homeless pairs overflow into the stash
+
+    def __init__(self, capacity: int, function, tables: int = 2) -> None:
+        """
+        Initialize new HashMap that uses cuckoo hashing over the given
+        number of tables (at least 2) for collision resolution
+        """
+        if tables < 2:
+            raise ValueError("cuckoo hashing needs at least 2 tables")
+        self._hash_function = function
+        self._tables_count = tables
+        self._random = random.Random()
+        self._size = 0
+        self._allocate(capacity)
+        self._frozen = False
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for number, table in enumerate(self._tables):
+            for i in range(table.length()):
+                out += str(number) + '.' + str(i) + ': ' + str(table[i]) + '\n'
+        out += 'stash: ' + ', '.join(str(entry) for entry in self._stash) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    @classmethod
+    def from_items(cls, items, function, expected_size: int = None) -> "HashMap":
+        """
+        Build a new HashMap from an iterable of key/value pairs, allocating the tables once with
+        enough capacity to hold expected_size pairs below the load limit.
+        """
+        if expected_size is None:
+            items = list(items)
+            expected_size = len(items)
+
+        new_map = cls(int(expected_size / cls._MAX_LOAD) + 1, function)
+        for key, value in items:
+            new_map.put(key, value)
+        return new_map
+
+    @classmethod
+    def from_dict(cls, source: dict, function) -> "HashMap":
+        """
+        Build a new HashMap holding the key/value pairs of a dictionary.
+        """
+        return cls.from_items(source.items(), function, len(source))
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replace the tables with empty ones holding at least capacity slots in total, and draw a
+        new seed for every table.
+        """
+        per_table = self._tables_count * self._SLOTS
+        self._buckets = max(1, -(-capacity // per_table))
+        self._capacity = self._buckets * per_table
+        self._tables = [BucketArray(self._buckets * self._SLOTS) for _ in range(self._tables_count)]
+        self._seeds = [self._random.getrandbits(64) for _ in range(self._tables_count)]
+        self._stash = []
+        self._stash_limit = self._STASH
+        self._frozen = False
+
+    def _bucket_start(self, number: int, key: object) -> int:
+        """
+        Return the index of the first slot of the bucket key belongs to in the given table.
+        """
+        return (seeded_hash(key, self._seeds[number]) % self._buckets) * self._SLOTS
+
+    def _locate(self, key: object) -> (int, int):
+        """
+        Return the table number and slot index holding key, (-1, stash index) if the key is in the
+        stash, or None if it is not present. Checks at most tables * slots + stash slots.
+        """
+        for number, table in enumerate(self._tables):
+            table = table.view()
+            start = self._bucket_start(number, key)
+            for index in range(start, start + self._SLOTS):
+                entry = table[index]
+                if entry is not None and entry.key == key:
+                    return number, index
+        for index, entry in enumerate(self._stash):
+            if entry.key == key:
+                return -1, index
+        return None
+
+    def _place(self, entry: HashEntry) -> HashEntry:
+        """
+        Store entry in a free slot of one of its buckets, displacing random occupants along the
+        way if all of them are full. Returns None once every displaced entry has a slot or went to
+        the stash, or the entry left without a place if the stash is full too.
+        """
+        # once the stash overflows, a displaced entry of the same full buckets as the last one
+        # ends the walk: keys that collide under every seed would only be swapped among themselves
+        overflowing = self._stash_limit > self._STASH
+        previous = None
+        for _ in range(self._MAX_KICKS):
+            starts = [self._bucket_start(number, entry.key) for number in range(self._tables_count)]
+            if overflowing and starts == previous:
+                break
+            previous = starts
+            for number, start in enumerate(starts):
+                table = self._tables[number].view()
+                for index in range(start, start + self._SLOTS):
+                    if table[index] is None:
+                        self._tables[number].preserve(index)
+                        table[index] = entry
+                        return None
+
+            number = self._random.randrange(self._tables_count)
+            index = starts[number] + self._random.randrange(self._SLOTS)
+            self._tables[number].preserve(index)
+            table = self._tables[number].view()
+            entry, table[index] = table[index], entry
+
+        if len(self._stash) < self._stash_limit:
+            self._stash.append(entry)
+            return None
+        return entry
+
+    def _rebuild(self, capacity: int, extra: HashEntry = None) -> None:
+        """
+        Reinsert every entry, plus extra if given, into new tables of at least capacity slots with
+        new seeds. Each time an entry is left without a place the tables are rebuilt with other
+        seeds, and after a few failed attempts with twice the capacity. Once _REBUILD_LIMIT
+        rebuilds have failed, the entries still without a place overflow into the stash, and the
+        stash may grow to twice its new length before another rebuild is tried, so keys that
+        collide under every seed cost amortized constant rebuilds instead of rebuilding forever.
+        """
+        entries = list(self._entries())
+        if extra is not None:
+            entries.append(extra)
+
+        for attempt in range(1, self._REBUILD_LIMIT + 1):
+            self._allocate(capacity)
+            if attempt < self._REBUILD_LIMIT:
+                if all(self._place(entry) is None for entry in entries):
+                    return
+                if attempt % self._REHASH_ATTEMPTS == 0:
+                    capacity = self._capacity * 2
+                continue
+
+            # last attempt: place what fits and overflow the rest into the stash
+            self._stash_limit = self._STASH + len(entries)
+            for entry in entries:
+                self._place(entry)
+            self._stash_limit = max(self._STASH, 2 * len(self._stash))
+
+    def _entries(self):
+        """
+        Iterate over the entries stored in the tables and the stash.
+        """
+        for table in self._tables:
+            for entry in table.view():
+                if entry is not None:
+                    yield entry
+        yield from self._stash
+
+    def _thaw(self) -> None:
+        """
+        Give a snapshot tables of its own before its first write. The entries need no copy since
+        they are never changed in place.
+        """
+        self._tables = [table.copy() for table in self._tables]
+        self._frozen = False
+
+    def snapshot(self) -> "HashMap":
+        """
+        Method that returns a copy of the map, sharing its tables through frozen views and copying
+        only the stash. This map saves every slot it writes afterwards for the copy, and replaces
+        entries instead of changing them, so the copy keeps showing the map as it was. Writing to
+        the copy first gives it tables of its own, in linear time. snapshot() itself must not run
+        while another thread writes to this map: call it from the writing thread, or hold the lock
+        the writers hold.
+        """
+        copy = type(self).__new__(type(self))
+        copy.__dict__.update(self.__dict__)
+        copy._tables = [table.frozen() for table in self._tables]
+        copy._stash = list(self._stash)
+        copy._random = random.Random(self._random.getrandbits(64))
+        copy._frozen = True
+        return copy
+
+    def put(self, key: object, value: object) -> None:
+        """
+        Method that updates the value of key, or adds the key/value pair if the key is not present.
+        The tables are grown first if the load would exceed 0.9. If no place is found for the new
+        pair the tables are rebuilt with new seeds.
+        """
+        self._insert(key, value)
+
+    def _insert(self, key: object, value: object, combine=None) -> None:
+        """
+        Place a key/value pair like put. If combine is given and the key is present, its value
+        becomes combine(current value, value). A present key gets a new entry rather than a
+        changed one, since snapshots may still see the old entry.
+        """
+        if self._frozen:
+            self._thaw()
+
+        location = self._locate(key)
+        if location is not None:
+            number, index = location
+            if number == -1:
+                entry = self._stash[index]
+            else:
+                entry = self._tables[number][index]
+            if combine is not None:
+                value = combine(entry.value, value)
+            if number == -1:
+                self._stash[index] = HashEntry(entry.key, value)
+            else:
+                self._tables[number].preserve(index)
+                self._tables[number][index] = HashEntry(entry.key, value)
+            return
+
+        if self._size + 1 > self._capacity * self._MAX_LOAD:
+            self._rebuild(self._capacity * 2)
+
+        homeless = self._place(HashEntry(key, value))
+        if homeless is not None:
+            self._rebuild(self._capacity, homeless)
+        self._size += 1
+
+    def get(self, key: object) -> object:
+        """
+        Method that returns the value of key, or None if the key is not present.
+        """
+        location = self._locate(key)
+        if location is None:
+            return None
+        number, index = location
+        if number == -1:
+            return self._stash[index].value
+        return self._tables[number][index].value
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Method that determines if key is present in the hash table.
+        """
+        return self._locate(key) is not None
+
+    def remove(self, key: object) -> None:
+        """
+        Method that removes key and its value, then moves stashed pairs whose buckets have a free
+        slot back into the tables. Does nothing if the key is not present.
+        """
+        location = self._locate(key)
+        if location is None:
+            return
+        if self._frozen:
+            self._thaw()
+
+        number, index = location
+        if number == -1:
+            self._stash.pop(index)
+        else:
+            self._tables[number].preserve(index)
+            self._tables[number][index] = None
+        self._size -= 1
+
+        for entry in list(self._stash):
+            for number in range(self._tables_count):
+                start = self._bucket_start(number, entry.key)
+                table = self._tables[number]
+                free = [index for index in range(start, start + self._SLOTS) if table[index] is None]
+                if free:
+                    table.preserve(free[0])
+                    table[free[0]] = entry
+                    self._stash.remove(entry)
+                    break
+
+    def table_load(self) -> float:
+        """
+        Method that returns a floating point value of the current table load. Takes no parameters.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Method that returns the current integer amount of empty slots in the tables.
+        """
+        return self._capacity - self._size + len(self._stash)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Method that rebuilds the tables with at least new_capacity slots in total and new seeds.
+        Does nothing if new_capacity is less than 1 or less than the number of pairs.
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+        self._rebuild(new_capacity)
+
+    def clear(self) -> None:
+        """
+        Method that clears the contents of the hash table without changing its capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Method that returns a Dynamic Array with the keys present in the hash table.
+        """
+        return DynamicArray([entry.key for entry in self._entries()])
+
+    def _reserve(self, size: int) -> None:
+        """
+        Grow the tables once, if needed, so that size pairs fit below the load limit.
+        """
+        if size > self._capacity * self._MAX_LOAD:
+            self._rebuild(int(size / self._MAX_LOAD) + 1)
+
+    def update(self, other) -> None:
+        """
+        Method that puts every key/value pair of another map into this one, replacing the values
+        of keys present in both. The tables are grown at most once up front.
+        """
+        self._reserve(self._size + other.get_size())
+        for key, value in other.items():
+            self._insert(key, value)
+
+    def merge(self, other, combine) -> None:
+        """
+        Method that works like update, except that a key present in both maps gets the value
+        combine(value in this map, value in other).
+        """
+        self._reserve(self._size + other.get_size())
+        for key, value in other.items():
+            self._insert(key, value, combine)
+
+    def diff(self, other) -> "HashMap":
+        """
+        Method that returns a new map holding the key/value pairs of this map whose key is missing
+        from other or maps to a different value there.
+        """
+        result = type(self)(int(self._size / self._MAX_LOAD) + 1, self._hash_function,
+                            self._tables_count)
+        for entry in self._entries():
+            if not other.contains_key(entry.key) or other.get(entry.key) != entry.value:
+                result.put(entry.key, entry.value)
+        return result
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the map
+        """
+        for entry in self._entries():
+            yield entry.key
+
+    def items(self):
+        """
+        Method that iterates over the key/value pairs of the map.
+        """
+        for entry in self._entries():
+            yield entry.key, entry.value
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(50, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nCuckoo - colliding keys example 1")
+    print("---------------------------------")
+    # every key hashes to the same value under hash_function_1, which the seeded tables avoid
+    m = HashMap(16, hash_function_1)
+    words = ['abc', 'acb', 'bac', 'bca', 'cab', 'cba', 'aad', 'ada', 'daa']
+    for word in words:
+        m.put(word, word.upper())
+    m.remove('bac')
+    print(m.get_size(), m.get('cba'), m.get('bac'), m.contains_key('daa'),
+          sorted(m) == sorted(set(words) - {"bac"}))
+
+    print("\nCuckoo - equal hash() example 1")
+    print("-------------------------------")
+    # keys with the same builtin hash() share every bucket, the ones without a slot overflow
+    class Collider:
+        def __init__(self, number):
+            self.number = number
+
+        def __eq__(self, other):
+            return isinstance(other, Collider) and self.number == other.number
+
+        def __hash__(self):
+            return 7
+
+    m = HashMap(16, hash_function_1)
+    for i in range(40):
+        m.put(Collider(i), i)
+    print(m.get_size(), m.get(Collider(39)), m.contains_key(Collider(40)), len(m._stash) > 4)
+
+    print("\nCuckoo - snapshot example 1")
+    print("---------------------------")
+    m = HashMap.from_dict({'str' + str(i): i for i in range(100)}, hash_function_2)
+    snap = m.snapshot()
+    m.put('str0', -1)
+    m.remove('str1')
+    m.resize_table(1000)
+    other = HashMap.from_dict({'str0': 10, 'new': 5}, hash_function_2)
+    m.merge(other, lambda mine, theirs: mine + theirs)
+    m.update(HashMap.from_dict({'str2': 'two'}, hash_function_2))
+    print(snap.get('str0'), snap.get('str1'), snap.get_size(), m.get('str0'), m.get('new'),
+          m.get('str2'), m.get_size(), sorted(m.diff(snap).items(), key=str))
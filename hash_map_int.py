@@ -0,0 +1,235 @@
+# Description: This program is an open addressing hash map specialized for 64 bit integer keys. Keys are
+#              stored in a typed array('q') instead of one HashEntry object per key, the bucket states
+#              (empty, in use or tombstone) in a bytearray and the values in a list alongside them. Keys
+#              are hashed with hash_int directly, without converting them to strings. Collisions are
+#              resolved with quadratic probing and the table is doubled whenever its load reaches 0.5,
+#              the same as the open addressing HashMap, whose method names it shares.
+
+
+from array import array
+from operator import index
+
+from a6_include import DynamicArray, hash_int
+
+
+_EMPTY, _LIVE, _TOMBSTONE = 0, 1, 2
+
+
+class IntHashMap:
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize new IntHashMap that uses
+        quadratic probing for collision resolution
+        """
+        self._keys = array('q', bytes(8 * capacity))
+        self._values = [None] * capacity
+        self._states = bytearray(capacity)
+
+        self._capacity = capacity
+        self._size = 0
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i])
+                        + ' TS: ' + str(self._states[i] == _TOMBSTONE) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    @classmethod
+    def from_items(cls, items, expected_size: int = None) -> "IntHashMap":
+        """
+        Build a new IntHashMap from an iterable of key/value pairs, allocating the table once
+        with enough capacity to hold expected_size pairs below the 0.5 load limit.
+        """
+        if expected_size is None:
+            items = list(items)
+            expected_size = len(items)
+
+        new_map = cls(2 * expected_size + 1)
+        for key, value in items:
+            new_map.put(key, value)
+        return new_map
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: int) -> int:
+        """
+        Return the index of the bucket holding key, or -1 if the key is not present.
+        """
+        key = index(key)                    # NumPy and other integer types hash like the int they equal
+        bucket_index = hash_int(key) % self._capacity
+        new_index = bucket_index
+        new_spot = 0
+        states, keys = self._states, self._keys
+
+        # stop at an empty bucket, or once the quadratic sequence starts repeating
+        while states[new_index] != _EMPTY and new_spot < self._capacity:
+            if states[new_index] == _LIVE and keys[new_index] == key:
+                return new_index
+            new_spot += 1
+            new_index = (bucket_index + new_spot * new_spot) % self._capacity
+        return -1
+
+    def put(self, key: int, value: object) -> None:
+        """
+        Method that updates the value of key, or adds the key/value pair if the key is not
+        present. The table is doubled first if its load is greater than or equal to 0.5. Tombstones
+        lengthen probes like pairs do, so once pairs and tombstones together reach half of the
+        table, it is rehashed at the same capacity to drop the tombstones.
+        """
+        if self._size / self._capacity >= 0.5:
+            self.resize_table(self._capacity * 2)
+        elif (self._size + self._tombstones) / self._capacity >= 0.5:
+            self.resize_table(self._capacity)
+
+        key = index(key)
+        bucket_index = hash_int(key) % self._capacity
+        new_index = bucket_index
+        new_spot = 0
+        tombstone = -1                      # first tombstone passed while probing
+        states, keys = self._states, self._keys
+
+        while states[new_index] != _EMPTY and new_spot < self._capacity:
+            if states[new_index] == _TOMBSTONE:
+                if tombstone == -1:
+                    tombstone = new_index
+            elif keys[new_index] == key:
+                self._values[new_index] = value
+                return
+            new_spot += 1
+            new_index = (bucket_index + new_spot * new_spot) % self._capacity
+
+        if tombstone != -1:
+            new_index = tombstone
+            self._tombstones -= 1
+        elif states[new_index] != _EMPTY:
+            # every bucket the probe sequence can reach is taken, grow the table and try again
+            self.resize_table(self._capacity * 2)
+            self.put(key, value)
+            return
+
+        keys[new_index] = key
+        self._values[new_index] = value
+        states[new_index] = _LIVE
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Method that returns a floating point value of the current table load. Takes no parameters.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Method that returns the current integer amount of empty buckets in the hash table.
+        Tombstones are not empty, probes have to go past them.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Method that changes the capacity of the table to new_capacity and rehashes every key/value
+        pair into it, dropping tombstones. Does nothing if new_capacity is less than 1 or less than
+        the number of pairs in the table.
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        old_keys, old_values, old_states = self._keys, self._values, self._states
+        self.__init__(new_capacity)
+        for index in range(len(old_states)):
+            if old_states[index] == _LIVE:
+                self.put(old_keys[index], old_values[index])
+
+    def get(self, key: int) -> object:
+        """
+        Method that returns the value associated with key, or None if the key is not present.
+        """
+        index = self._find(key)
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: int) -> bool:
+        """
+        Method that determines if key is present in the hash table.
+        """
+        return self._find(key) != -1
+
+    def remove(self, key: int) -> None:
+        """
+        Method that removes key from the hash table by marking its bucket as a tombstone.
+        Does nothing if the key is not present.
+        """
+        index = self._find(key)
+        if index != -1:
+            self._states[index] = _TOMBSTONE
+            self._values[index] = None
+            self._size -= 1
+            self._tombstones += 1
+
+    def clear(self) -> None:
+        """
+        Method that clears the contents of the hash table without changing its capacity.
+        """
+        self._states = bytearray(self._capacity)
+        self._values = [None] * self._capacity
+        self._size = 0
+        self._tombstones = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Method that returns a Dynamic Array with the keys present in the hash table.
+        """
+        return DynamicArray([self._keys[index] for index in range(self._capacity)
+                             if self._states[index] == _LIVE])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nIntHashMap - put example 1")
+    print("--------------------------")
+    m = IntHashMap(50)
+    for i in range(150):
+        m.put(i * 1000003, i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nIntHashMap - get and remove example 1")
+    print("-------------------------------------")
+    m = IntHashMap(10)
+    for key in (-1, 0, 2 ** 62, 7):
+        m.put(key, str(key))
+    m.remove(7)
+    print(m.get(-1), m.get(2 ** 62), m.get(7), m.contains_key(0), m.get_size())
+    print(m.get_keys())
+
+    print("\nIntHashMap - churn example 1")
+    print("----------------------------")
+    # removed keys leave tombstones, which are dropped before they fill the table
+    m = IntHashMap(64)
+    for i in range(10000):
+        m.put(i, i)
+        m.remove(i)
+    print(m.get_size(), m.get_capacity(), m.empty_buckets() >= m.get_capacity() // 2)
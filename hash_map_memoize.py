@@ -0,0 +1,112 @@
+# Description: This program implements memoize, a decorator that caches the results of a function in
+#              an LRUCache stored in the open addressing HashMap. Calls are keyed on the tuple of their
+#              arguments, hashed by the hash functions without converting it to a string, with a fast
+#              path for the common single string or integer argument calls. The cache is bounded by maxsize
+#              and evicts the least recently used result. Decorated functions gain cache_info, which
+#              reports the hit rate of that function, and cache_clear.
+
+
+from collections import namedtuple
+from functools import wraps
+
+import hash_map_oa
+from a6_include import hash_function_2
+from hash_map_cache import LRUCache
+
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions maxsize currsize hit_rate')
+
+_FAST_TYPES = (str, int)
+_KWARGS_MARK = object()             # separates positional from keyword arguments in a key
+_MISSING = object()
+
+
+def _make_key(args: tuple, kwargs: dict) -> object:
+    """
+    Build the cache key of a call. A single string or integer argument is its own key, any other
+    call is keyed on the tuple of its positional arguments followed by its sorted keyword arguments.
+    """
+    if not kwargs:
+        if len(args) == 1 and type(args[0]) in _FAST_TYPES:
+            return args[0]
+        return args
+
+    key = args + (_KWARGS_MARK,)
+    for item in sorted(kwargs.items()):
+        key += item
+    return key
+
+
+def memoize(func=None, *, maxsize: int = 128, function=hash_function_2):
+    """
+    Decorator that caches the results of func for up to maxsize distinct argument lists,
+    evicting the least recently used result once the cache is full. Can be applied as @memoize
+    or as @memoize(maxsize=...). Arguments must be keys the hash function accepts. The decorated
+    function has cache_info() and cache_clear() methods.
+    """
+    if maxsize < 1:
+        raise ValueError("maxsize must be at least 1")
+
+    def decorate(func):
+        def new_cache() -> LRUCache:
+            return LRUCache(function, max_entries=maxsize, engine=hash_map_oa.HashMap,
+                            capacity=2 * maxsize + 1)
+
+        cache = new_cache()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        def cache_info() -> CacheInfo:
+            """Return the hit, miss and eviction counts, the size and the hit rate of the cache."""
+            stats = cache.stats()
+            calls = stats.hits + stats.misses
+            return CacheInfo(stats.hits, stats.misses, stats.evictions, maxsize, stats.size,
+                             stats.hits / calls if calls else 0.0)
+
+        def cache_clear() -> None:
+            """Drop every cached result and reset the counters."""
+            nonlocal cache
+            cache = new_cache()
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    if func is not None:
+        return decorate(func)
+    return decorate
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nmemoize - fibonacci example 1")
+    print("-----------------------------")
+
+    @memoize
+    def fib(n: int) -> int:
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    print(fib(80), fib.cache_info())
+    fib.cache_clear()
+    print(fib.cache_info())
+
+    print("\nmemoize - eviction example 1")
+    print("----------------------------")
+    calls = []
+
+    @memoize(maxsize=2)
+    def shout(word: str, times: int = 1) -> str:
+        calls.append(word)
+        return (word.upper() + '!') * times
+
+    print(shout('a'), shout('b'), shout('a'), shout('c'), shout('b'), shout('a', times=2))
+    print(calls, shout.cache_info())
@@ -0,0 +1,313 @@
+# Description: This program is an open addressing hash map from 64 bit integer keys to 64 bit integer
+#              values, stored in NumPy int64 arrays instead of one HashEntry object per pair. Its batch
+#              methods, get_many, contains_many, put_many and remove_many, probe every query of a batch
+#              in lockstep: each round computes the next bucket of all unresolved queries as one array
+#              operation, so a batch of millions of ids costs a few dozen array operations rather than
+#              a Python loop per id. The capacity is kept a power of two and collisions are resolved with
+#              triangular probing (home + r * (r + 1) / 2), which visits every bucket. Requires NumPy.
+
+
+import numpy as np
+
+from a6_include import DynamicArray
+
+
+_EMPTY, _LIVE, _TOMBSTONE = 0, 1, 2
+
+
+def _mix(keys: np.ndarray) -> np.ndarray:
+    """
+    Hash an array of int64 keys with the 64 bit finalizer of MurmurHash3, returning uint64 hashes.
+    """
+    hashes = keys.view(np.uint64).copy()
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xFF51AFD7ED558CCD)
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xC4CEB9FE1A85EC53)
+    hashes ^= hashes >> np.uint64(33)
+    return hashes
+
+
+def _power_of_two(capacity: int) -> int:
+    """Return the smallest power of two that is at least capacity (and at least 8)."""
+    size = 8
+    while size < capacity:
+        size *= 2
+    return size
+
+
+class Int64HashMap:
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize new Int64HashMap that uses triangular probing for collision
+        resolution. The capacity is rounded up to a power of two.
+        """
+        self._capacity = _power_of_two(capacity)
+        self._keys = np.zeros(self._capacity, dtype=np.int64)
+        self._values = np.zeros(self._capacity, dtype=np.int64)
+        self._states = np.zeros(self._capacity, dtype=np.int8)
+        self._size = 0
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i])
+                        + ' TS: ' + str(self._states[i] == _TOMBSTONE) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    @classmethod
+    def from_arrays(cls, keys: np.ndarray, values: np.ndarray) -> "Int64HashMap":
+        """
+        Build a new Int64HashMap from parallel arrays of keys and values, sizing the table once.
+        """
+        new_map = cls(2 * len(keys))
+        new_map.put_many(keys, values)
+        return new_map
+
+    # ------------------------------------------------------------------ #
+
+    def _home(self, keys: np.ndarray) -> np.ndarray:
+        """Return the first bucket probed for each key."""
+        return (_mix(keys) & np.uint64(self._capacity - 1)).astype(np.int64)
+
+    def _lookup(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Return the bucket holding each key, or -1 where the key is not present. Every round
+        advances all unresolved keys by one probe step; a key is resolved once it is found or
+        its probe reaches an empty bucket.
+        """
+        found = np.full(len(keys), -1, dtype=np.int64)
+        home = self._home(keys)
+        active = np.arange(len(keys))
+        mask = self._capacity - 1
+        probe = 0
+
+        while active.size and probe < self._capacity:
+            slots = (home[active] + probe * (probe + 1) // 2) & mask
+            states = self._states[slots]
+            hit = (states == _LIVE) & (self._keys[slots] == keys[active])
+            found[active[hit]] = slots[hit]
+            active = active[~hit & (states != _EMPTY)]
+            probe += 1
+        return found
+
+    def _probe_for_insert(self, keys: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Return, for each key, the bucket already holding it (or -1) and the bucket a new pair
+        would go in: the first tombstone or empty bucket on its probe sequence.
+        """
+        found = np.full(len(keys), -1, dtype=np.int64)
+        target = np.full(len(keys), -1, dtype=np.int64)
+        home = self._home(keys)
+        active = np.arange(len(keys))
+        mask = self._capacity - 1
+        probe = 0
+
+        while active.size and probe < self._capacity:
+            slots = (home[active] + probe * (probe + 1) // 2) & mask
+            states = self._states[slots]
+            hit = (states == _LIVE) & (self._keys[slots] == keys[active])
+            found[active[hit]] = slots[hit]
+            free = (states != _LIVE) & (target[active] == -1)
+            target[active[free]] = slots[free]
+            active = active[~hit & (states != _EMPTY)]
+            probe += 1
+        return found, target
+
+    def _place(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """
+        Insert or update distinct keys, with the table already large enough to hold them.
+        When several new keys want the same bucket, the first one takes it and the others
+        probe again in the next pass.
+        """
+        pending = np.arange(len(keys))
+        while pending.size:
+            found, target = self._probe_for_insert(keys[pending])
+
+            present = found != -1
+            self._values[found[present]] = values[pending[present]]
+
+            new = pending[~present]
+            _, first = np.unique(target[~present], return_index=True)
+            winners = new[first]
+            slots = target[~present][first]
+            self._tombstones -= int(np.count_nonzero(self._states[slots] == _TOMBSTONE))
+            self._keys[slots] = keys[winners]
+            self._values[slots] = values[winners]
+            self._states[slots] = _LIVE
+            self._size += len(winners)
+
+            lost = np.ones(len(new), dtype=bool)
+            lost[first] = False
+            pending = new[lost]
+
+    def put_many(self, keys, values) -> None:
+        """
+        Method that stores every key/value pair of two parallel integer arrays. If a key repeats
+        within the batch, its last value wins. The table is grown once up front so its load stays
+        at or below 0.5. Tombstones count toward that limit too: if pairs and tombstones would
+        fill more than half the table, it is rehashed at the same capacity to drop them.
+        """
+        keys = np.asarray(keys, dtype=np.int64).ravel()
+        values = np.broadcast_to(np.asarray(values, dtype=np.int64), keys.shape)
+
+        # keep the last occurrence of each key
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - last
+        keys, values = keys[last], values[last]
+
+        needed = 2 * (self._size + len(keys))
+        if needed > self._capacity:
+            self.resize_table(needed)
+        elif needed + 2 * self._tombstones > self._capacity:
+            self.resize_table(self._capacity)
+        self._place(keys, values)
+
+    def get_many(self, keys, default: int = 0) -> np.ndarray:
+        """
+        Method that returns an int64 array with the value of each key in keys, or default
+        where a key is not present.
+        """
+        keys = np.asarray(keys, dtype=np.int64).ravel()
+        found = self._lookup(keys)
+        result = np.full(len(keys), default, dtype=np.int64)
+        present = found != -1
+        result[present] = self._values[found[present]]
+        return result
+
+    def contains_many(self, keys) -> np.ndarray:
+        """
+        Method that returns a boolean array telling which of the keys are present.
+        """
+        return self._lookup(np.asarray(keys, dtype=np.int64).ravel()) != -1
+
+    def remove_many(self, keys) -> None:
+        """
+        Method that removes every key in keys that is present, leaving tombstones behind.
+        """
+        found = self._lookup(np.unique(np.asarray(keys, dtype=np.int64).ravel()))
+        found = found[found != -1]
+        self._states[found] = _TOMBSTONE
+        self._size -= len(found)
+        self._tombstones += len(found)
+
+    def put(self, key: int, value: int) -> None:
+        """
+        Method that stores value for key, updating the value if key is already present.
+        """
+        self.put_many([key], [value])
+
+    def get(self, key: int) -> object:
+        """
+        Method that returns the value of key, or None if the key is not present.
+        """
+        found = self._lookup(np.array([key], dtype=np.int64))[0]
+        return None if found == -1 else int(self._values[found])
+
+    def contains_key(self, key: int) -> bool:
+        """
+        Method that determines if key is present in the hash table.
+        """
+        return bool(self.contains_many([key])[0])
+
+    def remove(self, key: int) -> None:
+        """
+        Method that removes key from the hash table. Does nothing if the key is not present.
+        """
+        self.remove_many([key])
+
+    def table_load(self) -> float:
+        """
+        Method that returns a floating point value of the current table load. Takes no parameters.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Method that returns the current integer amount of empty buckets in the hash table.
+        Tombstones are not empty: probes have to step over them.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Method that rehashes every pair into a table of new_capacity rounded up to a power of two,
+        dropping tombstones. Does nothing if new_capacity is less than 1 or than the map size.
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        keys, values = self.to_arrays()
+        self.__init__(new_capacity)
+        self._place(keys, values)
+
+    def clear(self) -> None:
+        """
+        Method that clears the contents of the hash table without changing its capacity.
+        """
+        self._states[:] = _EMPTY
+        self._size = 0
+        self._tombstones = 0
+
+    def to_arrays(self) -> (np.ndarray, np.ndarray):
+        """
+        Method that returns copies of the keys and the values present, as two parallel arrays.
+        """
+        live = self._states == _LIVE
+        return self._keys[live], self._values[live]
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Method that returns a Dynamic Array with the keys present in the hash table.
+        """
+        return DynamicArray(self.to_arrays()[0].tolist())
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nInt64HashMap - put_many example 1")
+    print("---------------------------------")
+    m = Int64HashMap(8)
+    ids = np.arange(0, 3_000_000, 3, dtype=np.int64)
+    m.put_many(ids, ids * 2)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nInt64HashMap - get_many example 1")
+    print("---------------------------------")
+    queries = np.array([0, 3, 4, 2_999_997, -3], dtype=np.int64)
+    print(m.get_many(queries, default=-1), m.contains_many(queries))
+
+    print("\nInt64HashMap - remove example 1")
+    print("-------------------------------")
+    m.remove_many(ids[:10])
+    m.put(3, 7)
+    print(m.get(0), m.get(3), m.get(30), m.get_size())
+
+    print("\nInt64HashMap - churn example 1")
+    print("------------------------------")
+    m = Int64HashMap(64)
+    for i in range(10_000):
+        m.put(i, i)
+        m.remove(i)
+    print(m.get_size(), m.get_capacity(), m.empty_buckets() >= m.get_capacity() // 2)
@@ -9,22 +9,42 @@
 #              is described in details in their individual doc-strings below.
 
 
-from a6_include import (DynamicArray, HashEntry,
-                        hash_function_1, hash_function_2)
+import secrets
+from functools import partial
+from itertools import islice
+
+from a6_include import (BucketArray, DynamicArray, HashEntry, KeyArena,
+                        hash_function_1, hash_function_2, seeded_hash_function)
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    _entry_type = HashEntry             # entry class for stored pairs, replaced by value-less sets
+    _FLOOD_PROBES = 64                  # probes for one insertion that count as a flooded table
+
+    def __init__(self, capacity: int, function, seed: int = None,
+                 arena: KeyArena = None) -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
+        quadratic probing for collision resolution.
+        If seed is given, keys are hashed with seeded_hash
+        under that seed instead of function, and the map
+        reseeds itself if it detects hash flooding. If arena
+        is given, string keys are interned in it
         """
-        self._buckets = DynamicArray()
-        for _ in range(capacity):
-            self._buckets.append(None)
+        self._buckets = BucketArray(capacity)
+        self._generations = BucketArray(capacity, 0, 'q')   # epoch each bucket was last written in
+        self._epoch = 0
+        self._frozen = False                                # arrays are frozen views taken by snapshot()
 
         self._capacity = capacity
-        self._hash_function = function
+        self._hash_function = function if seed is None else seeded_hash_function(seed)
+        self._flooded = False                               # an insertion probed too long
+        self._reseed_size = 0                               # size at the last reseed
+        self._keyed = seed is not None                      # only maps hashing with a seed reseed
+        self._arena = arena
+        if arena is not None:
+            arena.register(self)                            # the arena keeps the keys of its maps
+        self._bind_hash()
         self._size = 0
 
     def __str__(self) -> str:
@@ -33,7 +53,7 @@ class HashMap:
         """
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            out += str(i) + ': ' + str(self._slot(i)) + '\n'
         return out
 
     def get_size(self) -> int:
@@ -48,9 +68,129 @@ class HashMap:
         """
         return self._capacity
 
+    @classmethod
+    def from_items(cls, items, function, expected_size: int = None, seed: int = None,
+                   arena: KeyArena = None) -> "HashMap":
+        """
+        Build a new HashMap from an iterable of key/value pairs. The table is allocated once with
+        enough capacity to hold expected_size pairs below the 0.5 load limit, and those pairs are
+        inserted without the per-put load check. If expected_size is not given the iterable is read
+        into a list to count it. Pairs beyond expected_size fall back to put, and a repeated key
+        keeps its last value.
+        """
+        if expected_size is None:
+            items = list(items)
+            expected_size = len(items)
+
+        new_map = cls(2 * expected_size + 1, function, seed, arena)  # smallest capacity keeping the load below 0.5
+        iterator = iter(items)
+        for key, value in islice(iterator, expected_size):
+            new_map._insert(key, value)
+            if new_map._flooded:
+                new_map._check_flood()
+        for key, value in iterator:
+            new_map.put(key, value)
+        return new_map
+
+    @classmethod
+    def from_dict(cls, source: dict, function, seed: int = None,
+                  arena: KeyArena = None) -> "HashMap":
+        """
+        Build a new HashMap holding the key/value pairs of a dictionary.
+        """
+        return cls.from_items(source.items(), function, len(source), seed, arena)
+
     # ------------------------------------------------------------------ #
 
-    def put(self, key: str, value: object) -> None:
+    @property
+    def _table_class(self) -> type:
+        """
+        Return the class of the temporary maps built by the methods, such as the table a resize
+        rehashes into. A subclass wrapping the public methods (a profiled map) returns its base
+        class, so that the temporary maps do not run the wrappers.
+        """
+        return type(self)
+
+    def _bind_hash(self) -> None:
+        """
+        Set _hash, the function the methods hash keys with: the hash function itself, or, if the
+        map has an arena, a lookup in the arena's cache. Binding it once keeps the arena check out
+        of every call; it is bound again whenever the hash function changes.
+        """
+        if self._arena is None:
+            self._hash = self._hash_function
+        else:
+            self._hash = partial(self._arena.hash, function=self._hash_function)
+
+    def _slot(self, index: int) -> HashEntry:
+        """
+        Return the entry stored at index, or None if the bucket is empty. A bucket written
+        before the last clear belongs to an older epoch and reads as empty.
+        """
+        if self._generations.view()[index] != self._epoch:
+            return None
+        return self._buckets.view()[index]
+
+    def _own(self, index: int) -> HashEntry:
+        """
+        Prepare the bucket at index for writing and return its entry. A snapshot is copied before
+        its first write. The first write to a bucket after a snapshot was taken saves the bucket
+        for the snapshot and continues on a copy of its entry, so the snapshot never sees the change.
+        """
+        if self._frozen:
+            self._thaw()
+
+        entry = self._slot(index)
+        if not self._buckets._views:                # no snapshot was taken, nothing to save
+            return entry
+        shared = self._buckets.preserve(index) | self._generations.preserve(index)
+        if shared and entry is not None:
+            self._buckets.view()[index] = entry = self._copy_entry(entry)
+        return entry
+
+    def _copy_entry(self, entry: HashEntry) -> HashEntry:
+        """
+        Return a copy of an entry, tombstone flag included.
+        """
+        entry_copy = self._entry_type(entry.key, entry.value, entry.hash)
+        entry_copy.is_tombstone = entry.is_tombstone
+        return entry_copy
+
+    def _thaw(self) -> None:
+        """
+        Give a snapshot arrays and entries of its own before its first write. Entries are copied
+        too, since the map the snapshot was taken from changes the entries it has not saved
+        for a snapshot in place.
+        """
+        frozen = self._buckets, self._generations     # keeps the map saving buckets until the copy is done
+        self._buckets, self._generations = frozen[0].copy(), frozen[1].copy()
+        self._frozen = False
+
+        buckets, epoch = self._buckets.view(), self._epoch
+        for index, generation in enumerate(self._generations.view()):
+            if generation == epoch and buckets[index] is not None:
+                buckets[index] = self._copy_entry(buckets[index])
+
+    def snapshot(self) -> "HashMap":
+        """
+        Method that returns a copy of the map in constant time. The copy reads frozen views of the
+        bucket arrays of this map. The first time this map writes a bucket afterwards, it saves the
+        bucket for the copy and writes to a copy of its entry, so the copy keeps showing the map as
+        it was and can be read and iterated, from other threads too, while this map keeps changing.
+        Writing to the copy first gives it arrays of its own, in linear time. snapshot() itself must
+        not run while another thread writes to this map: call it from the writing thread, or hold
+        the lock the writers hold.
+        """
+        copy = type(self).__new__(type(self))
+        copy.__dict__.update(self.__dict__)
+        copy._buckets = self._buckets.frozen()
+        copy._generations = self._generations.frozen()
+        copy._frozen = True
+        if copy._arena is not None:
+            copy._arena.register(copy)
+        return copy
+
+    def put(self, key: object, value: object) -> None:
         """
         Method that updates the key/value pair in the hash map. If the given key already exists, the
         current key's value is replaced with the given value. If the key is not present in the current
@@ -60,39 +200,78 @@ class HashMap:
         0.5, the hash table will be resized and the current key/value pairs will be rehashed into the new
         table. Takes 2 parameters, key to be added to the table and its associated value.
         """
+        self._put(key, value)
+        self._check_flood()
 
+    def _put(self, key: object, value: object, hash: int = None) -> None:
+        """
+        Resize the table if needed, then place the key/value pair with _insert.
+        """
         # check table load, resize if greater than or equal to 0.5
         if self.table_load() >= 0.5:
             self.resize_table(self._capacity * 2)                   # resize to 2x current capacity
 
-        bucket_index = self._hash_function(key) % self._capacity    # index of hash of current key
-        new_index = self._hash_function(key) % self._capacity       # new index if index already contains key/value pair
-        placer = self._buckets[bucket_index]                        # set placer to key at bucket index
+        self._insert(key, value, hash)
+
+    def _insert(self, key: object, value: object, hash: int = None, combine=None) -> None:
+        """
+        Place a key/value pair using quadratic probing without checking the table load.
+        The caller is responsible for making sure the table has room for the new pair.
+        hash is the key's hash if it is already known; entries cache it so the key never has
+        to be hashed again. If combine is given and the key is present, its value becomes
+        combine(current value, value). String keys are interned if the map has an arena.
+        """
+        if self._arena is not None:
+            key = self._arena.intern(key)                           # store the shared copy of the key
+        if hash is None:
+            hash = self._hash(key)
+        buckets, generations, epoch = self._buckets.view(), self._generations.view(), self._epoch
+        capacity = self._capacity
+        bucket_index = hash % capacity                              # index of hash of current key
+        new_index = bucket_index                                    # new index if index already contains key/value pair
+        placer = buckets[new_index] if generations[new_index] == epoch else None
         new_spot = 0                                                # used for quadratic probing
+        tombstone = -1                                              # index of first tombstone passed while probing
 
         # if placer is not None, probe to an empty spot in the table
-        while placer:
-            # account for removed values by checking if the current placer is a tombstone
-            # if a tombstone is found, replace the the tombstone with the new key/value
+        while placer and new_spot < capacity:
+            # remember the first tombstone, it is reused if the key turns out to be absent
             if placer.is_tombstone:
-                placer.key = key
-                placer.value = value
-                placer.is_tombstone = False         #reset tombstone to False
-                self._size += 1
-                return
-            # while probing, if the key to be placed matches an existing key, replace existing keys value
-            if placer.key == key:
-                placer.value = value
+                if tombstone == -1:
+                    tombstone = new_index
+            # while probing, if the key to be placed matches an existing key, replace existing keys value;
+            # the same key object or a different cached hash settles the comparison without calling ==
+            elif placer.key is key or (placer.hash == hash and placer.key == key):
+                placer = self._own(new_index)
+                placer.value = value if combine is None else combine(placer.value, value)
                 return
             # if spot is not empty, continue to probe
             new_spot += 1
-            new_index = (bucket_index + new_spot**2) % self._capacity
-            placer = self._buckets[new_index]
+            new_index = (bucket_index + new_spot * new_spot) % capacity
+            placer = buckets[new_index] if generations[new_index] == epoch else None
 
-        # reaches here when there is an empty spot, adds key/value to the table
-        self._buckets[new_index] = HashEntry(key, value)
-        self._size += 1
+        if new_spot > self._FLOOD_PROBES:
+            self._flooded = True
+
+        if placer and tombstone == -1:
+            # every bucket the probe sequence can reach is taken, grow the table and try again
+            self.resize_table(self._capacity * 2)
+            self._insert(key, value, hash, combine)
+            return
 
+        if tombstone != -1:
+            # replace the tombstone with the new key/value
+            tombstone = self._own(tombstone)
+            tombstone.key = key
+            tombstone.value = value
+            tombstone.hash = hash
+            tombstone.is_tombstone = False                          # reset tombstone to False
+        else:
+            # reaches here when there is an empty spot, adds key/value to the table
+            self._own(new_index)                                    # may replace frozen arrays
+            self._buckets.view()[new_index] = self._entry_type(key, value, hash)
+            self._generations.view()[new_index] = epoch
+        self._size += 1
 
     def table_load(self) -> float:
         """
@@ -117,109 +296,135 @@ class HashMap:
         """
         if new_capacity < 1 or new_capacity < self._size:
             return
+        self._rebuild(new_capacity, self._hash_function)
 
-        old_buckets = self._buckets                             # maintain the current buckets in the hash table
-
-        new_map = HashMap(new_capacity, self._hash_function)    # create new hash map that will store the rehashed
+    def _rebuild(self, new_capacity: int, function) -> None:
+        """
+        Rehash every pair into a table of new_capacity using function. The hashes cached in the
+        entries are reused when function is the current hash function.
+        """
+        new_map = self._table_class(new_capacity, function)     # create new hash map that will store the rehashed
                                                                 # values
-        # iterate through the current buckets
-        for bucket in range(old_buckets.length()):
-            # skip over a bucket if it is empty or the key/value pair present is a tombstone
-            if old_buckets[bucket] is None or old_buckets[bucket].is_tombstone:
-                continue
-            else:
-                # rehash values into the new map accordingly
-                new_map.put(old_buckets[bucket].key, old_buckets[bucket].value)
+        same_function = function is self._hash_function
+        # iterate through the current entries, skipping empty buckets and tombstones
+        for entry in self._live_entries():
+            # place values into the new map accordingly, reusing their cached hashes
+            new_map._put(entry.key, entry.value, entry.hash if same_function else None)
 
         # set current hash map buckets and capacity to the rehashed buckets based on the new capacity
+        self._hash_function = function
+        self._bind_hash()
         self._buckets = new_map._buckets
+        self._generations = new_map._generations
+        self._epoch = new_map._epoch
         self._capacity = new_map._capacity
+        self._frozen = False
 
-    def get(self, key: str) -> object:
+    def _check_flood(self) -> None:
         """
-        Method that takes a key as a parameter and returns the value that is associated with the given
-        key. Method quadratically probes to find the key in the hash map.
+        Called after insertions, including each insertion of the bulk operations. If one of them
+        probed more than _FLOOD_PROBES buckets, which random keys essentially never do below the
+        0.5 load limit, the keys are likely crafted to collide under the hash function (hash
+        flooding). A map created with a seed then switches to a new random seed and rehashes every
+        pair. To keep insertion amortized constant time, the map is only reseeded again once its
+        size has doubled. Maps hashing with the function they were given never change it, so their
+        layout and key order stay deterministic.
         """
+        if not self._flooded:
+            return
+        self._flooded = False
+        if not self._keyed or self._size < 2 * self._reseed_size:
+            return
+        self._reseed_size = self._size
+        self._rebuild(self._capacity, seeded_hash_function(secrets.randbits(64)))
 
-        bucket_index = self._hash_function(key) % self._capacity  # index of hash of current key
-        placer = self._buckets[bucket_index]  # set placer to key at bucket index
+    def _find(self, key: object, hash: int = None) -> HashEntry:
+        """
+        Return the entry holding key, or None if the key is not present.
+        """
+        index = self._find_index(key, hash)
+        return None if index == -1 else self._buckets.view()[index]
+
+    def _find_index(self, key: object, hash: int = None) -> int:
+        """
+        Quadratically probe for key and return the index of its entry, or -1 if the key is not present.
+        A hash already known for the key (cached in an entry) can be passed to skip rehashing it.
+        """
+        if hash is None:
+            hash = self._hash(key)
+        buckets, generations, epoch = self._buckets.view(), self._generations.view(), self._epoch
+        capacity = self._capacity
+        bucket_index = hash % capacity  # index of hash of current key
+        new_index = bucket_index
+        placer = buckets[new_index] if generations[new_index] == epoch else None
         new_spot = 0  # used for quadratic probing
 
-        # if placer is not None, probe to an empty spot in the table
-        while placer:
-            # while probing, if the key to be placed matches an existing key, replace existing keys value
-            if placer.key == key:
-                if placer.is_tombstone:
-                    return None
-                else:
-                    return placer.value
+        # if placer is not None, probe to an empty spot in the table; after capacity probes
+        # the quadratic sequence repeats, so every bucket it can reach has been checked
+        while placer and new_spot < capacity:
+            # while probing, if the key matches an existing key that is not a tombstone, return its entry
+            if (placer.key is key or (placer.hash == hash and placer.key == key)) and not placer.is_tombstone:
+                return new_index
             # if spot is not empty, continue to probe
             new_spot += 1
             # maintain original index, utilize new index value to go to the next probe index
-            new_index = (bucket_index + new_spot ** 2) % self._capacity
-            placer = self._buckets[new_index]
+            new_index = (bucket_index + new_spot * new_spot) % capacity
+            placer = buckets[new_index] if generations[new_index] == epoch else None
+        return -1
 
+    def _probe_length(self, key: object) -> int:
+        """
+        Return the number of buckets a lookup of key inspects, for profiling.
+        """
+        hash = self._hash(key)
+        bucket_index = hash % self._capacity
+        placer = self._slot(bucket_index)
+        new_spot = 0
+
+        while placer and new_spot < self._capacity:
+            if (placer.key is key or (placer.hash == hash and placer.key == key)) and not placer.is_tombstone:
+                break
+            new_spot += 1
+            placer = self._slot((bucket_index + new_spot ** 2) % self._capacity)
+        return new_spot + 1
+
+    def get(self, key: object) -> object:
+        """
+        Method that takes a key as a parameter and returns the value that is associated with the given
+        key. Method quadratically probes to find the key in the hash map.
+        """
+        entry = self._find(key)
+        if entry is not None:
+            return entry.value
 
-    def contains_key(self, key: str) -> bool:
+    def contains_key(self, key: object) -> bool:
         """
         Method that determines if a given key is present in the hash table. Quadratically probes
         using the given key to find an initial value in the hash table. Returns True if the key
         is present in the table, returns False if the key is present or if they key is a tombstone
         """
-        bucket_index = self._hash_function(key) % self._capacity  # index of hash of current key
-        placer = self._buckets[bucket_index]  # set placer to key at bucket index
-        new_spot = 0  # used for quadratic probing
-
-        # if placer is not None, probe to an empty spot in the table
-        while placer:
-            # while probing, if the key to be placed matches an existing key, replace existing keys value
-            if placer.key == key:
-                if placer.is_tombstone:
-                    return False
-                else:
-                    return True
-            # if spot is not empty, continue to probe
-            new_spot += 1
-            new_index = (bucket_index + new_spot ** 2) % self._capacity
-            placer = self._buckets[new_index]
-
-        return False
+        return self._find(key) is not None
 
-    def remove(self, key: str) -> None:
+    def remove(self, key: object) -> None:
         """
         Method that removes a key/value pair from the hash table. Quadratically probes the table starting
         at the index determined by putting the key through the hash function. If a given key is already
         marked as a tombstone, the method will do nothing. Otherwise, if the key is found, the object
         at the given key is marked as a tombstone (is_tombstone = True). They key/value are unchanged.
         """
-        bucket_index = self._hash_function(key) % self._capacity  # index of hash of current key
-        placer = self._buckets[bucket_index]  # set placer to key at bucket index
-        new_spot = 0  # used for quadratic probing
-
-        # if placer is not None, probe to an empty spot in the table
-        while placer:
-            # while probing, if the key to be placed matches an existing key, replace existing keys value
-            if placer.key == key:
-                # if key is already a tombstone, exit
-                if placer.is_tombstone:
-                    return
-                else:
-                    # make object a tombstone - decrement size of hash map
-                    placer.is_tombstone = True
-                    self._size -= 1
-                    return
-            # if spot is not empty, continue to probe
-            new_spot += 1
-            new_index = (bucket_index + new_spot ** 2) % self._capacity
-            placer = self._buckets[new_index]
-
+        index = self._find_index(key)
+        if index != -1:
+            # make object a tombstone - decrement size of hash map
+            self._own(index).is_tombstone = True
+            self._size -= 1
 
     def clear(self) -> None:
         """
-        Method that clears the contents of the hash table. Takes no parameters.
+        Method that clears the contents of the hash table in constant time. Takes no parameters.
+        Starting a new epoch makes every bucket written before the clear read as empty; the old
+        entries are overwritten lazily as new keys are placed.
         """
-        new_map = HashMap(self._capacity, self._hash_function)  # create new hash table with same capacity
-        self._buckets = new_map._buckets                        # clear buckets of the old hash table
+        self._epoch += 1                                        # buckets of older epochs read as empty
         self._size = 0                                          # reset size of hash table
 
     def get_keys(self) -> DynamicArray:
@@ -229,13 +434,99 @@ class HashMap:
         """
         key_array = DynamicArray()
         # iterate through hash table, append keys to the new array
-        for bucket in range(self._buckets.length()):
-            # skip over tombstones
-            if self._buckets[bucket] is not None and not self._buckets[bucket].is_tombstone:
-                key_array.append(self._buckets[bucket].key)
+        for entry in self._live_entries():
+            key_array.append(entry.key)
 
         return key_array
 
+    def _live_entries(self):
+        """
+        Yield the entries that are neither empty nor tombstones, in bucket order.
+        """
+        epoch = self._epoch
+        for entry, generation in zip(self._buckets.view(), self._generations.view()):
+            if generation == epoch and entry is not None and not entry.is_tombstone:
+                yield entry
+
+    def _hashed_items(self, other) -> tuple:
+        """
+        Yield (key, value, hash) for every pair of another map. The hashes cached in the entries
+        of an open addressing map using the same hash function are reused, other keys are hashed.
+        """
+        if isinstance(other, HashMap) and other._hash_function is self._hash_function:
+            for entry in other._live_entries():
+                yield entry.key, entry.value, entry.hash
+        else:
+            for key, value in other.items():
+                yield key, value, self._hash(key)
+
+    def _reserve(self, size: int) -> None:
+        """
+        Grow the table once, if needed, so that size pairs fit below the 0.5 load limit.
+        """
+        if size / self._capacity >= 0.5:
+            self.resize_table(2 * size + 1)
+
+    def update(self, other) -> None:
+        """
+        Method that puts every key/value pair of another map into this one, replacing the values
+        of keys present in both. The table is grown at most once up front, and when other is an
+        open addressing map with the same hash function its cached hashes are reused.
+        """
+        self._reserve(self._size + other.get_size())
+        function = self._hash_function
+        for key, value, hash in self._hashed_items(other):
+            # a reseed while inserting makes the hashes computed before it stale
+            self._insert(key, value, hash if self._hash_function is function else None)
+            if self._flooded:
+                self._check_flood()
+
+    def merge(self, other, combine) -> None:
+        """
+        Method that works like update, except that a key present in both maps gets the value
+        combine(value in this map, value in other).
+        """
+        self._reserve(self._size + other.get_size())
+        function = self._hash_function
+        for key, value, hash in self._hashed_items(other):
+            # a reseed while inserting makes the hashes computed before it stale
+            self._insert(key, value, hash if self._hash_function is function else None, combine)
+            if self._flooded:
+                self._check_flood()
+
+    def diff(self, other) -> "HashMap":
+        """
+        Method that returns a new map holding the key/value pairs of this map whose key is missing
+        from other or maps to a different value there. When other is an open addressing map with
+        the same hash function, the cached hashes are used to probe it and to fill the result.
+        """
+        result = self._table_class(2 * self._size + 1, self._hash_function, arena=self._arena)
+        same_function = isinstance(other, HashMap) and other._hash_function is self._hash_function
+
+        for entry in self._live_entries():
+            if same_function:
+                match = other._find(entry.key, entry.hash)
+                differs = match is None or match.value != entry.value
+            else:
+                differs = not other.contains_key(entry.key) or other.get(entry.key) != entry.value
+            if differs:
+                result._insert(entry.key, entry.value, entry.hash)
+        return result
+
+    def __iter__(self):
+        """
+        Iterate over the keys present in the hash table, in bucket order.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def items(self):
+        """
+        Method that iterates over the key/value pairs present in the hash table, in bucket order,
+        without copying them into a Dynamic Array first.
+        """
+        for entry in self._live_entries():
+            yield entry.key, entry.value
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -426,3 +717,79 @@ if __name__ == "__main__":
     m.remove('100')
     m.resize_table(2)
     print(m.get_keys())
+
+    print("\nPDF - snapshot example 1")
+    print("------------------------")
+    m = HashMap(20, hash_function_1)
+    for i in range(5):
+        m.put('key' + str(i), i * 10)
+    snap = m.snapshot()
+    m.put('key0', -1)
+    m.remove('key1')
+    m.put('key5', 50)
+    m.resize_table(100)
+    print(snap.get_size(), snap.get('key0'), snap.get('key1'), snap.contains_key('key5'))
+    print(m.get_size(), m.get('key0'), m.get('key1'), m.get('key5'), m.get_capacity())
+    snap.put('key9', 90)
+    print(snap.get_size(), snap.get('key9'), m.contains_key('key9'))
+
+    print("\nPDF - update example 1")
+    print("----------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(4):
+        m.put('key' + str(i), i)
+    other = HashMap.from_dict({'key1': 100, 'key7': 70}, hash_function_2)
+    m.update(other)
+    print(m.get_size(), m.get('key1'), m.get('key7'))
+    m.merge(other, lambda mine, theirs: mine + theirs)
+    print(m.get_size(), m.get('key1'), m.get('key7'))
+    print(sorted(m.diff(other).items()))
+
+    print("\nPDF - seed example 1")
+    print("--------------------")
+    # anagrams collide under hash_function_1, a seeded map hashes them with seeded_hash instead
+    first = HashMap(31, hash_function_1, seed=42)
+    second = HashMap(31, hash_function_1, seed=42)
+    for word in ['abc', 'acb', 'bac', 'bca', 'cab', 'cba']:
+        first.put(word, word.upper())
+        second.put(word, word.upper())
+    print(first.get_size(), first.get('bca'), list(first) == list(second))
+
+    print("\nPDF - arena example 1")
+    print("---------------------")
+    arena = KeyArena()
+    first = HashMap(10, hash_function_1, arena=arena)
+    second = HashMap(10, hash_function_1, arena=arena)
+    first.put(''.join(['sha', 'red']), 1)
+    second.put(''.join(['sha', 'red']), 2)
+    print(len(arena), 'shared' in arena, next(iter(first)) is next(iter(second)))
+
+    print("\nPDF - clear example 3")
+    print("---------------------")
+    # clear starts a new epoch instead of emptying the buckets, the old ones read as empty
+    m = HashMap(1000, hash_function_1)
+    for i in range(300):
+        m.put(i, i)
+    m.clear()
+    print(m.get_size(), m.get(5), m.empty_buckets(), m.get_capacity())
+    m.put(5, 'five')
+    print(m.get_size(), m.get(5), m.empty_buckets())
+
+    print("\nPDF - key types example 1")
+    print("-------------------------")
+    # keys comparing equal hash alike: numbers equal to an int, and dataclasses whatever the
+    # values of their compare=False fields
+    from dataclasses import dataclass, field
+    from decimal import Decimal
+
+    @dataclass(frozen=True)
+    class Point:
+        x: int
+        y: int
+        label: str = field(default='', compare=False)
+
+    m = HashMap(11, hash_function_2)
+    m.put(5, 'five')
+    m.put(Point(1, 2, 'first'), 'point')
+    m.put(Point(1, 2, 'second'), 'same point')
+    print(m.get_size(), m.get(Decimal(5)), m.get(5.0), m.get(Point(1, 2)), m.get(Decimal('5.5')))
@@ -0,0 +1,249 @@
+# Description: This program is an insertion ordered hash map with a split, compact layout in the style of
+#              CPython's dict. The key/value pairs live in dense parallel lists of hashes, keys and values,
+#              in the order they were inserted. The hash table itself is only a small array of integer
+#              indices into those lists, using the narrowest type (int8, int16, int32 or int64) that can
+#              hold an index for its capacity. Iteration and get_keys follow insertion order, and
+#              resizing only rebuilds the index array from the cached hashes, without rehashing any key
+#              or moving values. Collisions are resolved with CPython's perturbed probing over a power
+#              of two capacity, and the index is rebuilt once it is two thirds full.
+
+
+from array import array
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+
+
+_EMPTY = -1                 # index slot never used
+_DUMMY = -2                 # index slot whose entry was removed
+_DELETED = object()         # key of a removed entry, until the entries are compacted
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+_PERTURB_SHIFT = 5
+
+
+def _index_typecode(capacity: int) -> str:
+    """Return the narrowest signed array typecode able to hold every entry index of a table."""
+    if capacity <= 2 ** 7:
+        return 'b'
+    if capacity <= 2 ** 15:
+        return 'h'
+    if capacity <= 2 ** 31:
+        return 'i'
+    return 'q'
+
+
+def _power_of_two(capacity: int) -> int:
+    """Return the smallest power of two that is at least capacity (and at least 8)."""
+    size = 8
+    while size < capacity:
+        size *= 2
+    return size
+
+
+class OrderedHashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new OrderedHashMap whose index array has capacity
+        rounded up to a power of two
+        """
+        self._hash_function = function
+        self._hashes = []
+        self._keys = []
+        self._values = []
+        self._size = 0
+        self._build_index(_power_of_two(capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i, (key, value) in enumerate(self.items()):
+            out += str(i) + ': ' + str(key) + ': ' + str(value) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _build_index(self, capacity: int) -> None:
+        """
+        Compact the entry lists, dropping removed entries, and rebuild an index array of the given
+        capacity from the cached hashes. Keys are not rehashed and values do not move.
+        """
+        if self._size != len(self._keys):
+            live = [i for i, key in enumerate(self._keys) if key is not _DELETED]
+            self._hashes = [self._hashes[i] for i in live]
+            self._keys = [self._keys[i] for i in live]
+            self._values = [self._values[i] for i in live]
+
+        self._capacity = capacity
+        self._usable = capacity * 2 // 3
+        self._indices = array(_index_typecode(capacity), [_EMPTY]) * capacity
+
+        mask = capacity - 1
+        indices = self._indices
+        for entry_index, hash in enumerate(self._hashes):
+            slot = hash & mask
+            perturb = hash
+            while indices[slot] != _EMPTY:
+                perturb >>= _PERTURB_SHIFT
+                slot = (slot * 5 + perturb + 1) & mask
+            indices[slot] = entry_index
+
+    def _lookup(self, key: object, hash: int) -> (int, int):
+        """
+        Probe the index array for key. Return the slot holding the key and its entry index,
+        or the first empty slot on the probe sequence and -1 if the key is not present.
+        """
+        mask = self._capacity - 1
+        slot = hash & mask
+        perturb = hash
+        indices, keys, hashes = self._indices, self._keys, self._hashes
+
+        while True:
+            entry_index = indices[slot]
+            if entry_index == _EMPTY:
+                return slot, -1
+            if entry_index >= 0:
+                found = keys[entry_index]
+                if found is key or (hashes[entry_index] == hash and found == key):
+                    return slot, entry_index
+            perturb >>= _PERTURB_SHIFT
+            slot = (slot * 5 + perturb + 1) & mask
+
+    def put(self, key: object, value: object) -> None:
+        """
+        Method that updates the value of key, or appends the key/value pair after every other
+        pair if the key is not present. Updating a key keeps its place in the order. The index is
+        rebuilt, larger if needed, once two thirds of its slots have been used.
+        """
+        hash = self._hash_function(key) & _MASK_64
+        slot, entry_index = self._lookup(key, hash)
+        if entry_index != -1:
+            self._values[entry_index] = value
+            return
+
+        if len(self._keys) >= self._usable:
+            self._build_index(_power_of_two(3 * (self._size + 1)))
+            slot, _ = self._lookup(key, hash)
+
+        self._indices[slot] = len(self._keys)
+        self._hashes.append(hash)
+        self._keys.append(key)
+        self._values.append(value)
+        self._size += 1
+
+    def get(self, key: object) -> object:
+        """
+        Method that returns the value of key, or None if the key is not present.
+        """
+        entry_index = self._lookup(key, self._hash_function(key) & _MASK_64)[1]
+        if entry_index != -1:
+            return self._values[entry_index]
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Method that determines if key is present in the hash table.
+        """
+        return self._lookup(key, self._hash_function(key) & _MASK_64)[1] != -1
+
+    def remove(self, key: object) -> None:
+        """
+        Method that removes key and its value. The index slot becomes a dummy and the entry is
+        dropped the next time the index is rebuilt. Does nothing if the key is not present.
+        """
+        slot, entry_index = self._lookup(key, self._hash_function(key) & _MASK_64)
+        if entry_index == -1:
+            return
+        self._indices[slot] = _DUMMY
+        self._keys[entry_index] = _DELETED
+        self._values[entry_index] = None
+        self._size -= 1
+
+    def table_load(self) -> float:
+        """
+        Method that returns a floating point value of the current table load. Takes no parameters.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Method that returns the current integer amount of empty buckets in the index array.
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Method that rebuilds the index array with new_capacity rounded up to a power of two large
+        enough for the current pairs. Only the index is rebuilt; the entries keep their order.
+        Does nothing if new_capacity is less than 1 or less than the number of pairs.
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+        self._build_index(_power_of_two(max(new_capacity, 3 * self._size // 2 + 1)))
+
+    def clear(self) -> None:
+        """
+        Method that removes every pair without changing the capacity.
+        """
+        self._hashes, self._keys, self._values = [], [], []
+        self._size = 0
+        self._build_index(self._capacity)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Method that returns a Dynamic Array with the keys of the map in insertion order.
+        """
+        return DynamicArray([key for key in self._keys if key is not _DELETED])
+
+    def __iter__(self):
+        """
+        Iterate over the keys in insertion order.
+        """
+        for key in self._keys:
+            if key is not _DELETED:
+                yield key
+
+    def items(self):
+        """
+        Method that iterates over the key/value pairs in insertion order.
+        """
+        for key, value in zip(self._keys, self._values):
+            if key is not _DELETED:
+                yield key, value
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nOrderedHashMap - put example 1")
+    print("------------------------------")
+    m = OrderedHashMap(10, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity(),
+                  m._indices.typecode)
+
+    print("\nOrderedHashMap - order example 1")
+    print("--------------------------------")
+    m = OrderedHashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    m.remove('100')
+    m.put('110', 'updated')
+    m.put('100', 'back')
+    print(m.get_keys())
+    m.resize_table(1000)
+    print(m.get_keys(), m.get('110'), m.contains_key('150'), m.get_capacity())
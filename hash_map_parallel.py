@@ -0,0 +1,247 @@
+# Description: This program builds and resizes the HashMaps in parallel. Keys are hashed in chunks by a
+#              pool of workers: processes by default, since hashing with the sample hash functions is
+#              pure Python and holds the GIL, or threads on free-threaded Python, where they run in
+#              parallel without pickling the keys. Another process only hashes keys the sample functions
+#              and seeded_hash hash the same way in every process; other keys, and every key of other
+#              hash functions, are hashed in this process, since the built in hash() they may rely on
+#              differs between processes. For separate chaining, the pairs are then split by the leading
+#              part of their bucket index into disjoint ranges of buckets, one per worker. No two ranges
+#              share a bucket, so with a thread pool every range is filled by its own thread straight
+#              into the one bucket array, without locks, and the chains come out the same as a serial
+#              build; that runs in parallel on free-threaded Python. With a process pool, and for open
+#              addressing, whose probe sequences cross any range boundary, pairs are placed serially
+#              using the precomputed hashes. A map with a seed is checked for hash flooding while it is
+#              filled.
+
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import repeat
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import KeyArena, hash_function_1, hash_function_2, portable_key, seeded_hash
+
+
+_MIN_PARALLEL = 10000           # pairs below which the pool costs more than it saves
+
+
+def free_threaded() -> bool:
+    """
+    Return True if the interpreter runs without the GIL, so threads can hash and build in parallel.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _workers(workers: int) -> int:
+    """Return the number of workers to use, one per CPU by default."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, workers)
+
+
+def _pool(workers: int, executor):
+    """
+    Return a context manager giving the executor to run on: the caller's executor, which is
+    left running, or a new thread pool on free-threaded Python and process pool otherwise.
+    """
+    if executor is not None:
+        return nullcontext(executor)
+    if free_threaded():
+        return ThreadPoolExecutor(workers)
+    return ProcessPoolExecutor(workers)
+
+
+def _portable_function(function) -> bool:
+    """
+    Return True if function is one of the hash functions known to hash portable keys the same
+    way in every process: the sample functions and seeded_hash under a fixed seed.
+    """
+    if function is hash_function_1 or function is hash_function_2:
+        return True
+    return isinstance(function, partial) and function.func is seeded_hash and not function.args
+
+
+def _hash_keys(function, keys: list) -> list:
+    """Return the hash of every key. Runs in a worker, so function must be picklable for processes."""
+    return [function(key) for key in keys]
+
+
+def _hashes(function, keys: list, workers: int, executor) -> list:
+    """
+    Return the hash of every key, hashing chunks of the keys on the pool, in key order. A pool of
+    other processes only hashes keys that hash alike in every process, with a known hash function;
+    the other keys are hashed here, since hashing them in a worker could place them in the wrong
+    bucket for this process.
+    """
+    if isinstance(executor, ThreadPoolExecutor):
+        portable, remote_keys = None, keys              # threads share this process, any key will do
+    elif _portable_function(function):
+        portable = [portable_key(key) for key in keys]
+        remote_keys = [key for key, remote in zip(keys, portable) if remote]
+    else:
+        return [function(key) for key in keys]
+
+    chunk = max(1, -(-len(remote_keys) // (workers * 4)))
+    chunks = [remote_keys[start:start + chunk] for start in range(0, len(remote_keys), chunk)]
+    hashes = []
+    for part in executor.map(_hash_keys, repeat(function), chunks):
+        hashes.extend(part)
+    if portable is None:
+        return hashes
+
+    # merge the hashes of the workers with those of the keys hashed here, in key order
+    remote_hashes = iter(hashes)
+    return [next(remote_hashes) if remote else function(key) for key, remote in zip(keys, portable)]
+
+
+def _place_range(hash_map: hash_map_sc.HashMap, placements: list) -> list:
+    """
+    Place the pairs of one range of buckets, given as (bucket index, key, value) in input order.
+    Only buckets of the range are written, so ranges can be placed concurrently. If the map hashes
+    with a seed and a chain grows long enough to signal hash flooding, placing stops, so that the
+    map can be reseeded, and the pairs not placed are returned.
+    """
+    for number, (bucket_index, key, value) in enumerate(placements):
+        if hash_map._flooded and hash_map._keyed:
+            return placements[number:]
+        hash_map._put_at(bucket_index, key, value)
+    return []
+
+
+def _fill_chains(hash_map: hash_map_sc.HashMap, items: list, hashes: list, workers: int,
+                 executor) -> list:
+    """
+    Place every pair in a new separate chaining map, split into one disjoint range of buckets per
+    worker by the leading part of the bucket index. The ranges are filled concurrently by the
+    threads of executor if given, and one after another otherwise. Returns the pairs left out
+    when placing stopped for hash flooding, as (bucket index, key, value).
+    """
+    capacity = hash_map.get_capacity()
+    ranges = [[] for _ in range(workers)]
+    for (key, value), hash in zip(items, hashes):
+        bucket_index = hash % capacity
+        ranges[bucket_index * workers // capacity].append((bucket_index, key, value))
+
+    if executor is None:
+        return [pair for placements in ranges for pair in _place_range(hash_map, placements)]
+
+    # the workers share the size counter, so the pairs are counted once every range is done
+    leftovers = list(executor.map(partial(_place_range, hash_map), ranges))
+    hash_map._size = sum(1 for _ in hash_map._live_nodes())
+    return [pair for placements in leftovers for pair in placements]
+
+
+def parallel_from_items(items, function, engine=hash_map_sc.HashMap, seed: int = None,
+                        arena: KeyArena = None, workers: int = None, executor=None):
+    """
+    Build a new HashMap of class engine from an iterable of key/value pairs, like
+    engine.from_items, hashing the keys on workers (one per CPU by default). executor may be an
+    existing thread or process pool to run on. A repeated key keeps its last value. Keys whose
+    hash may differ between processes are hashed in this process. With a thread pool, the chains
+    of a separate chaining map are also filled by the threads, one range of buckets each. A map
+    with a seed is checked for hash flooding while it is filled, as by put. engine must be the
+    open addressing or the separate chaining HashMap, or a subclass of one; a ValueError is raised
+    otherwise, since the build relies on their constructor and placement methods.
+    """
+    if not (isinstance(engine, type) and issubclass(engine, (hash_map_oa.HashMap, hash_map_sc.HashMap))):
+        raise ValueError("engine must be hash_map_oa.HashMap, hash_map_sc.HashMap or a subclass")
+    items = list(items)
+    if arena is not None:
+        # interned up front, so placement threads only ever find keys in the arena
+        items = [(arena.intern(key), value) for key, value in items]
+    workers = _workers(workers)
+    chaining = issubclass(engine, hash_map_sc.HashMap)
+    new_map = engine(max(len(items), 1) if chaining else 2 * len(items) + 1, function, seed, arena)
+    if workers == 1 or len(items) < _MIN_PARALLEL:
+        for key, value in items:
+            new_map.put(key, value)
+        return new_map
+
+    with _pool(workers, executor) as pool:
+        function = new_map._hash_function
+        hashes = _hashes(function, [key for key, _ in items], workers, pool)
+        if chaining:
+            threads = pool if isinstance(pool, ThreadPoolExecutor) else None
+            leftovers = _fill_chains(new_map, items, hashes, workers, threads)
+            # placing stopped for flooding: reseed, then put the rest under the new seed
+            new_map._check_flood()
+            for _, key, value in leftovers:
+                new_map.put(key, value)
+        else:
+            for (key, value), hash in zip(items, hashes):
+                # a reseed while inserting makes the hashes computed before it stale
+                new_map._insert(key, value, hash if new_map._hash_function is function else None)
+                if new_map._flooded:
+                    new_map._check_flood()
+    return new_map
+
+
+def parallel_resize(hash_map, new_capacity: int, workers: int = None, executor=None) -> None:
+    """
+    Resize hash_map to new_capacity like its resize_table, rehashing the keys of a separate
+    chaining map on workers (one per CPU by default). Open addressing entries cache their hash,
+    so there is nothing to compute in parallel and they are resized with resize_table.
+    """
+    workers = _workers(workers)
+    if (new_capacity < 1 or not isinstance(hash_map, hash_map_sc.HashMap)
+            or workers == 1 or hash_map.get_size() < _MIN_PARALLEL):
+        hash_map.resize_table(new_capacity)
+        return
+
+    items = [(node.key, node.value) for node in hash_map._live_nodes()]
+    new_map = hash_map._table_class(new_capacity, hash_map._hash_function)
+    with _pool(workers, executor) as pool:
+        hashes = _hashes(hash_map._hash_function, [key for key, _ in items], workers, pool)
+        threads = pool if isinstance(pool, ThreadPoolExecutor) else None
+        _fill_chains(new_map, items, hashes, workers, threads)
+    hash_map._adopt(new_map)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nParallel - build example 1")
+    print("--------------------------")
+    pairs = [(i, 'value' + str(i)) for i in range(30000)] + [(7, 'last')]
+    for engine in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+        m = parallel_from_items(pairs, hash_function_2, engine, workers=4)
+        serial = engine.from_items(pairs, hash_function_2)
+        print(engine.__module__, m.get_size(), m.get(7), m.get(29999),
+              sorted(m.items(), key=str) == sorted(serial.items(), key=str))
+
+    print("\nParallel - thread pool example 1")
+    print("--------------------------------")
+    # a thread pool fills the chains concurrently, one range of buckets per thread
+    with ThreadPoolExecutor(4) as threads:
+        m = parallel_from_items(pairs, hash_function_1, workers=4, executor=threads)
+    print(m.get_size(), str(m) == str(hash_map_sc.HashMap.from_items(pairs, hash_function_1)))
+
+    print("\nParallel - process independent hashing example 1")
+    print("------------------------------------------------")
+    # objects hashed by address are hashed in this process, strings by the workers
+    objects = [(object(), i) for i in range(6000)] + [('key' + str(i), i) for i in range(6000)]
+    m = parallel_from_items(objects, hash_function_2, hash_map_oa.HashMap, workers=2)
+    print(m.get_size(), m.get(objects[5][0]), m.get('key5999'))
+
+    print("\nParallel - resize example 1")
+    print("---------------------------")
+    m = hash_map_sc.HashMap(100, hash_function_1)
+    for i in range(20000):
+        m.put(i, str(i))
+    parallel_resize(m, 40000, workers=4)
+    print(free_threaded(), m.get_capacity(), m.get_size(), m.get(19999), m.empty_buckets())
+
+    print("\nParallel - engine example 1")
+    print("---------------------------")
+    # other maps take different constructor arguments and have no placement methods to fill
+    import hash_map_cuckoo
+    try:
+        parallel_from_items(pairs, hash_function_2, hash_map_cuckoo.HashMap, workers=4)
+    except ValueError as error:
+        print(error)
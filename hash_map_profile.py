@@ -0,0 +1,337 @@
+# Description: This program implements MapProfiler, a sampling profiler for the HashMap implementations.
+#              Attaching a profiler to a map switches the map to a subclass whose put, get, contains_key,
+#              remove and resize_table are timed; detaching switches it back, so a map without a profiler
+#              pays nothing. One call in every sample_every is recorded with its duration, the time spent
+#              in the hash function, the probe count (open addressing) or chain length (separate chaining)
+#              of its key and, optionally, the peak memory and number of blocks it allocated (tracemalloc)
+#              and the Python calls it made (sys.monitoring, on interpreters that have it). Every resize
+#              is recorded and can call
+#              before/after hooks. Records go to a ring buffer keeping the most recent ones, which can be
+#              dumped on demand.
+
+
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_1, hash_function_2
+
+
+ProfileRecord = namedtuple('ProfileRecord',
+                           'operation key duration_ns hash_ns probes size capacity peak_bytes allocations calls')
+
+_PROFILED = ('put', 'get', 'contains_key', 'remove')
+
+
+class RingBuffer:
+    """
+    Fixed size buffer keeping the most recent items appended to it.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer holding at most capacity items."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._items = [None] * capacity
+        self._next = 0                  # index the next item is written to
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return number of items in the buffer"""
+        return self._count
+
+    def __iter__(self):
+        """Iterate over the items, oldest first"""
+        capacity = len(self._items)
+        start = (self._next - self._count) % capacity
+        for offset in range(self._count):
+            yield self._items[(start + offset) % capacity]
+
+    def append(self, item: object) -> None:
+        """Add item, overwriting the oldest item if the buffer is full."""
+        self._items[self._next] = item
+        self._next = (self._next + 1) % len(self._items)
+        self._count = min(self._count + 1, len(self._items))
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self._items = [None] * len(self._items)
+        self._next = self._count = 0
+
+
+class _CallCounter:
+    """
+    Counts the Python functions started while it is enabled, using sys.monitoring.
+    """
+
+    _TOOL_IDS = 6                       # tool ids sys.monitoring hands out
+
+    def __init__(self, tool: int) -> None:
+        """Claim the given tool id of sys.monitoring. Raises ValueError if it is in use."""
+        self._monitoring = sys.monitoring
+        self._monitoring.use_tool_id(tool, 'hash_map_profile')
+        self._tool = tool
+        self._monitoring.register_callback(self._tool, self._monitoring.events.PY_START, self._count)
+        self.calls = 0
+
+    @classmethod
+    def claim(cls) -> "_CallCounter":
+        """
+        Return a counter using the profiler tool id of sys.monitoring or, if another tool (a
+        debugger, a coverage tool, another profiler) holds it, the first free tool id. Returns
+        None if every tool id is in use.
+        """
+        profiler_id = sys.monitoring.PROFILER_ID
+        for tool in [profiler_id] + [tool for tool in range(cls._TOOL_IDS) if tool != profiler_id]:
+            try:
+                return cls(tool)
+            except ValueError:
+                continue                # held by another tool
+        return None
+
+    def _count(self, code, instruction_offset) -> None:
+        """PY_START callback"""
+        self.calls += 1
+
+    def start(self) -> None:
+        """Start counting from zero."""
+        self.calls = 0
+        self._monitoring.set_events(self._tool, self._monitoring.events.PY_START)
+
+    def stop(self) -> int:
+        """Stop counting and return the number of calls counted."""
+        self._monitoring.set_events(self._tool, 0)
+        return self.calls
+
+    def close(self) -> None:
+        """Release the tool id."""
+        self._monitoring.register_callback(self._tool, self._monitoring.events.PY_START, None)
+        self._monitoring.free_tool_id(self._tool)
+
+
+class MapProfiler:
+    def __init__(self, sample_every: int = 1, buffer_size: int = 1024,
+                 trace_allocations: bool = False, count_calls: bool = False,
+                 before_resize=None, after_resize=None, clock=time.perf_counter_ns) -> None:
+        """
+        Initialize a new profiler recording one in every sample_every calls into a ring buffer
+        of buffer_size records. trace_allocations records the peak memory each sampled call
+        allocated above the memory in use when it started, with tracemalloc, and the number of
+        memory blocks it left allocated. count_calls records the Python calls it made, if
+        sys.monitoring is available and has a free tool id when the first map is attached (calls
+        is None otherwise).
+        before_resize(map, new_capacity) and after_resize(map, old_capacity, duration_ns) are
+        called around every resize of an attached map.
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self._sample_every = sample_every
+        self._countdown = sample_every
+        self._records = RingBuffer(buffer_size)
+        self._trace_allocations = trace_allocations
+        self._count_calls = count_calls and hasattr(sys, 'monitoring')
+        self._counter = None
+        self._started_tracemalloc = False
+        self._depth = 0                                     # sampled calls in progress
+        self.before_resize = before_resize
+        self.after_resize = after_resize
+        self._clock = clock
+        self._attached = {}                                 # id of map -> map, for maps attached explicitly
+        self._classes = {}                                  # original class -> profiled subclass
+
+    def attach(self, hash_map) -> None:
+        """
+        Method that starts profiling hash_map, by switching it to a subclass of its class whose
+        public methods are timed. Maps copied from it with snapshot() are profiled too.
+        """
+        if getattr(type(hash_map), '_profiler', None) is self:
+            return
+        if not self._attached:
+            self._start_tracing()
+        original = type(hash_map)
+        if original not in self._classes:
+            self._classes[original] = self._profiled_class(original)
+        hash_map.__class__ = self._classes[original]
+        self._attached[id(hash_map)] = hash_map
+
+    def detach(self, hash_map) -> None:
+        """
+        Method that stops profiling hash_map, or a snapshot of a profiled map, and restores its
+        class. The records are kept.
+        """
+        profiled = type(hash_map)
+        if getattr(profiled, '_profiler', None) is not self:
+            return
+        hash_map.__class__ = profiled.__bases__[0]
+        if self._attached.pop(id(hash_map), None) is not None and not self._attached:
+            self._stop_tracing()
+
+    def records(self) -> list:
+        """
+        Method that returns the recorded calls, oldest first.
+        """
+        return list(self._records)
+
+    def clear(self) -> None:
+        """
+        Method that drops every record.
+        """
+        self._records.clear()
+
+    def dump(self, file=None) -> None:
+        """
+        Method that writes the recorded calls, oldest first, one per line to file (standard
+        output by default).
+        """
+        file = sys.stdout if file is None else file
+        for record in self._records:
+            line = (record.operation + ' ' + repr(record.key) + ': ' + str(record.duration_ns) + ' ns'
+                    + ' (hash ' + str(record.hash_ns) + ' ns)' + ' probes ' + str(record.probes)
+                    + ' size ' + str(record.size) + ' capacity ' + str(record.capacity))
+            if record.peak_bytes is not None:
+                line += ' peak ' + str(record.peak_bytes) + ' B allocations ' + str(record.allocations)
+            if record.calls is not None:
+                line += ' calls ' + str(record.calls)
+            print(line, file=file)
+
+    # ------------------------------------------------------------------ #
+
+    def _start_tracing(self) -> None:
+        """Start tracemalloc and claim sys.monitoring, as requested, when the first map is attached."""
+        if self._trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self._count_calls:
+            self._counter = _CallCounter.claim()
+
+    def _stop_tracing(self) -> None:
+        """Undo _start_tracing once the last map is detached."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self._counter is not None:
+            self._counter.close()
+            self._counter = None
+
+    def _sampled(self) -> bool:
+        """Return True for one call in every sample_every."""
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self._sample_every
+        return True
+
+    def _measure(self, operation: str, hash_map, method, args: tuple, key: object,
+                 probes: bool) -> object:
+        """
+        Call method(hash_map, *args) and record its duration, and optionally its allocations
+        and Python calls. The hash time and probe length of key are measured before the call,
+        outside the timed region, so they describe the map the call ran on. Allocations and calls
+        are only recorded for the outermost sampled call: a resize run by a sampled put gets a
+        record of its own, but its allocations and calls count toward the put.
+        """
+        hash_ns = length = None
+        if probes:
+            start = self._clock()
+            hash_map._hash_function(key)
+            hash_ns = self._clock() - start
+            if hasattr(hash_map, '_probe_length'):
+                length = hash_map._probe_length(key)
+
+        outermost = not self._depth
+        tracing = outermost and self._trace_allocations and tracemalloc.is_tracing()
+        counting = outermost and self._counter is not None
+        if tracing:
+            tracemalloc.reset_peak()
+            in_use = tracemalloc.get_traced_memory()[0]
+            blocks = sys.getallocatedblocks()
+        if counting:
+            self._counter.start()
+
+        self._depth += 1
+        try:
+            start = self._clock()
+            result = method(hash_map, *args)
+            duration = self._clock() - start
+        finally:
+            self._depth -= 1
+            calls = self._counter.stop() if counting else None
+
+        peak_bytes = allocations = None
+        if tracing:
+            allocations = sys.getallocatedblocks() - blocks - 1      # the int holding blocks
+            peak_bytes = tracemalloc.get_traced_memory()[1] - in_use
+
+        self._records.append(ProfileRecord(operation, key, duration, hash_ns, length,
+                                           hash_map.get_size(), hash_map.get_capacity(),
+                                           peak_bytes, allocations, calls))
+        return result
+
+    def _profiled_class(self, original: type) -> type:
+        """
+        Return a subclass of original whose public methods report to this profiler.
+        """
+        profiler = self
+
+        def timed(name: str):
+            method = getattr(original, name)
+
+            def wrapper(hash_map, key, *args):
+                if not profiler._sampled():
+                    return method(hash_map, key, *args)
+                return profiler._measure(name, hash_map, method, (key,) + args, key, True)
+
+            wrapper.__name__ = name
+            wrapper.__doc__ = method.__doc__
+            return wrapper
+
+        def resize_table(hash_map, new_capacity: int) -> None:
+            old_capacity = hash_map.get_capacity()
+            if profiler.before_resize is not None:
+                profiler.before_resize(hash_map, new_capacity)
+            start = profiler._clock()
+            profiler._measure('resize_table', hash_map, original.resize_table,
+                              (new_capacity,), None, False)
+            if profiler.after_resize is not None:
+                profiler.after_resize(hash_map, old_capacity, profiler._clock() - start)
+
+        namespace = {name: timed(name) for name in _PROFILED if hasattr(original, name)}
+        namespace['resize_table'] = resize_table
+        namespace['_profiler'] = profiler
+        namespace['_table_class'] = original        # maps built inside the methods are not profiled
+        return type('Profiled' + original.__name__, (original,), namespace)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nMapProfiler - sampling example 1")
+    print("--------------------------------")
+    resizes = []
+    profiler = MapProfiler(sample_every=40, buffer_size=8,
+                           after_resize=lambda m, old, ns: resizes.append((old, m.get_capacity())))
+    for engine in (hash_map_oa.HashMap, hash_map_sc.HashMap):
+        m = engine(16, hash_function_1)
+        profiler.attach(m)
+        for i in range(200):
+            m.put('key' + str(i), i)
+        m.resize_table(500)
+        profiler.detach(m)
+        print(type(m).__name__, m.get('key7'), len(profiler.records()),
+              [(record.operation, record.key, record.probes) for record in profiler.records()][-3:])
+    print(resizes)
+
+    print("\nMapProfiler - dump example 1")
+    print("----------------------------")
+    profiler = MapProfiler(trace_allocations=True, clock=lambda: 0)
+    m = hash_map_sc.HashMap(4, hash_function_2)
+    profiler.attach(m)
+    m.put('alpha', 1)
+    m.get('alpha')
+    m.remove('beta')
+    profiler.detach(m)
+    profiler.dump()
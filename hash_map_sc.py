@@ -1,28 +1,48 @@
 # Description: This program is the implementation of the Hash Map data structure using chaining
 #              for collision resolution. The HashMap is initialized as a dynamic array of empty
-#              singly linked lists and contains methods to add, remove, and adjust items depending
-#              on input from the user. A separate function is included outside of the HashMap class,
+#              buckets; a bucket holds its first key/value pair inline and becomes a singly linked
+#              list once a second pair lands in it. It contains methods to add, remove, and adjust
+#              items depending on input from the user. A separate function is included outside of the HashMap class,
 #              find_mode, that allows a user to find the mode (most occurring) value of a dynamic array.
 #              The find_mode function utilizes the HashMap data structure for storage and keeping track
 #              of occurrences of the values in the dynamic array.
 
 
-from a6_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+import secrets
+from functools import partial
+
+from a6_include import (BucketArray, DynamicArray, KeyArena, LinkedList, SLNode,
+                        hash_function_1, hash_function_2, seeded_hash_function)
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    _node_type = SLNode                 # node class for stored pairs, replaced by value-less sets
+    _FLOOD_CHAIN = 32                   # chain length, beyond twice the load, that counts as flooded
+
+    def __init__(self, capacity: int, function, seed: int = None,
+                 arena: KeyArena = None) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
+        separate chaining for collision resolution.
+        If seed is given, keys are hashed with seeded_hash
+        under that seed instead of function, and the map
+        reseeds itself if it detects hash flooding. If arena
+        is given, string keys are interned in it
         """
-        self._buckets = DynamicArray()
-        for _ in range(capacity):
-            self._buckets.append(LinkedList())
+        self._buckets = BucketArray(capacity)
+        self._generations = BucketArray(capacity, 0, 'q')   # epoch each bucket was last written in
+        self._epoch = 0
+        self._frozen = False                                # arrays are frozen views taken by snapshot()
 
         self._capacity = capacity
-        self._hash_function = function
+        self._hash_function = function if seed is None else seeded_hash_function(seed)
+        self._flooded = False                               # a chain grew too long
+        self._reseed_size = 0                               # size at the last reseed
+        self._keyed = seed is not None                      # only maps hashing with a seed reseed
+        self._arena = arena
+        if arena is not None:
+            arena.register(self)                            # the arena keeps the keys of its maps
+        self._bind_hash()
         self._size = 0
 
     def __str__(self) -> str:
@@ -31,7 +51,12 @@ class HashMap:
         """
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            bucket = self._bucket(i)
+            if bucket is None:
+                bucket = 'SLL []'
+            elif not isinstance(bucket, LinkedList):
+                bucket = 'SLL [' + str(bucket) + ']'
+            out += str(i) + ': ' + str(bucket) + '\n'
         return out
 
     def get_size(self) -> int:
@@ -46,26 +71,213 @@ class HashMap:
         """
         return self._capacity
 
+    @classmethod
+    def from_items(cls, items, function, expected_size: int = None, seed: int = None,
+                   arena: KeyArena = None) -> "HashMap":
+        """
+        Build a new HashMap from an iterable of key/value pairs. The bucket array is allocated once
+        with one bucket per expected pair (a table load of 1.0), so the finished map never needs a
+        resize. If expected_size is not given the iterable is read into a list to count it. A repeated
+        key keeps its last value.
+        """
+        if expected_size is None:
+            items = list(items)
+            expected_size = len(items)
+
+        new_map = cls(max(expected_size, 1), function, seed, arena)
+        for key, value in items:
+            new_map.put(key, value)
+        return new_map
+
+    @classmethod
+    def from_dict(cls, source: dict, function, seed: int = None,
+                  arena: KeyArena = None) -> "HashMap":
+        """
+        Build a new HashMap holding the key/value pairs of a dictionary.
+        """
+        return cls.from_items(source.items(), function, len(source), seed, arena)
+
     # ------------------------------------------------------------------ #
 
-    def put(self, key: str, value: object) -> None:
+    @property
+    def _table_class(self) -> type:
+        """
+        Return the class of the temporary maps built by the methods, such as the table a resize
+        rehashes into. A subclass wrapping the public methods (a profiled map) returns its base
+        class, so that the temporary maps do not run the wrappers.
+        """
+        return type(self)
+
+    def _bind_hash(self) -> None:
+        """
+        Set _hash, the function the methods hash keys with: the hash function itself, or, if the
+        map has an arena, a lookup in the arena's cache. Binding it once keeps the arena check out
+        of every call; it is bound again whenever the hash function changes.
+        """
+        if self._arena is None:
+            self._hash = self._hash_function
+        else:
+            self._hash = partial(self._arena.hash, function=self._hash_function)
+
+    def _bucket(self, index: int):
+        """
+        Return the bucket stored at index. A bucket written before the last clear belongs
+        to an older epoch and reads as empty (None).
+        """
+        if self._generations.view()[index] != self._epoch:
+            return None
+        return self._buckets.view()[index]
+
+    def _set_bucket(self, index: int, bucket) -> None:
+        """
+        Store a bucket at index and stamp it with the current epoch.
+        """
+        self._buckets.view()[index] = bucket
+        self._generations.view()[index] = self._epoch
+
+    def _own(self, index: int):
+        """
+        Prepare the bucket at index for writing and return it. A snapshot is copied before its
+        first write. The first write to a bucket after a snapshot was taken saves the bucket for
+        the snapshot and continues on a copy of its nodes, so the snapshot never sees the change.
+        """
+        if self._frozen:
+            self._thaw()
+
+        bucket = self._bucket(index)
+        if not self._buckets._views:                # no snapshot was taken, nothing to save
+            return bucket
+        shared = self._buckets.preserve(index) | self._generations.preserve(index)
+        if shared and bucket is not None:
+            bucket = self._copy_bucket(bucket)
+            self._buckets.view()[index] = bucket
+        return bucket
+
+    def _copy_bucket(self, bucket):
+        """
+        Return a copy of a non-empty bucket holding copies of its nodes, in the same order.
+        """
+        nodes = [self._node_type(node.key, node.value) for node in self._bucket_nodes(bucket)]
+        if not isinstance(bucket, LinkedList):
+            return nodes[0]
+        bucket = LinkedList()
+        for node in reversed(nodes):
+            bucket.insert_node(node)
+        return bucket
+
+    def _thaw(self) -> None:
+        """
+        Give a snapshot arrays and nodes of its own before its first write. Nodes are copied too,
+        since the map the snapshot was taken from changes the buckets it has not saved for a
+        snapshot in place.
+        """
+        frozen = self._buckets, self._generations     # keeps the map saving buckets until the copy is done
+        self._buckets, self._generations = frozen[0].copy(), frozen[1].copy()
+        self._frozen = False
+
+        buckets, epoch = self._buckets.view(), self._epoch
+        for index, generation in enumerate(self._generations.view()):
+            if generation == epoch and buckets[index] is not None:
+                buckets[index] = self._copy_bucket(buckets[index])
+
+    def snapshot(self) -> "HashMap":
+        """
+        Method that returns a copy of the map in constant time. The copy reads frozen views of the
+        bucket arrays of this map. The first time this map writes a bucket afterwards, it saves the
+        bucket for the copy and writes to a copy of its nodes, so the copy keeps showing the map as
+        it was and can be read and iterated, from other threads too, while this map keeps changing.
+        Writing to the copy first gives it arrays of its own, in linear time. snapshot() itself must
+        not run while another thread writes to this map: call it from the writing thread, or hold
+        the lock the writers hold.
+        """
+        copy = type(self).__new__(type(self))
+        copy.__dict__.update(self.__dict__)
+        copy._buckets = self._buckets.frozen()
+        copy._generations = self._generations.frozen()
+        copy._frozen = True
+        if copy._arena is not None:
+            copy._arena.register(copy)
+        return copy
+
+    @staticmethod
+    def _bucket_nodes(bucket) -> tuple:
+        """
+        Return the nodes stored in a bucket. Buckets are None while empty, hold a single
+        SLNode inline, and only become a LinkedList once a second key lands in them.
+        """
+        if bucket is None:
+            return ()
+        if isinstance(bucket, LinkedList):
+            return bucket
+        return bucket,
+
+    def _find_node(self, bucket_index: int, key: object) -> SLNode:
+        """
+        Return the node holding key in the given bucket, or None if the key is not present.
+        """
+        bucket = self._bucket(bucket_index)
+        if bucket is None:
+            return None
+        if isinstance(bucket, LinkedList):
+            return bucket.contains(key)
+        return bucket if bucket.key is key or bucket.key == key else None
+
+    def put(self, key: object, value: object) -> None:
         """
         Method that places a key value pair in the HashMap. The function utilizes the given
         hash function to determine where the key/value pair is to be placed in the map. If the
         key already exists in the map, the key is maintained but the value of the key is changed
         to the value that is input into the function. If the key is not present, the key/value pair
-        is added to the HashMap. Takes two parameters, key - a string to be used in the hash function,
+        is added to the HashMap. Takes two parameters, key - a hashable key to be used in the hash function,
         and the value that is associated with that key.
         """
-        bucket_index = self._hash_function(key) % self._capacity    # determine DA index to place key/value pair
-        new_bucket = self._buckets[bucket_index]
-        check_contains = new_bucket.contains(key)                   # determine if a key is present in the SLL
+        bucket_index = self._hash(key) % self._capacity             # determine DA index to place key/value pair
+        self._put_at(bucket_index, key, value)
+        self._check_flood()
+
+    def _put_at(self, bucket_index: int, key: object, value: object, combine=None) -> None:
+        """
+        Place a key/value pair in the bucket at bucket_index. If combine is given and the key is
+        present, its value becomes combine(current value, value). String keys are interned if the
+        map has an arena.
+        """
+        if self._arena is not None:
+            key = self._arena.intern(key)                           # store the shared copy of the key
+        bucket = self._own(bucket_index)
+
+        if combine is not None:
+            node = self._find_node(bucket_index, key)
+            if node is not None:
+                node.value = combine(node.value, value)
+                return
+
+        # an empty bucket stores its first key/value pair inline, without a list object
+        if bucket is None:
+            self._set_bucket(bucket_index, self._node_type(key, value))
+            self._size += 1
+            return
+
+        if not isinstance(bucket, LinkedList):
+            if bucket.key is key or bucket.key == key:
+                bucket.value = value                                # replace value of the inline pair
+                return
+            # second key in this bucket, materialize a SLL holding both pairs
+            chain = LinkedList()
+            chain.insert_node(bucket)
+            chain.insert_node(self._node_type(key, value))
+            self._buckets.view()[bucket_index] = chain
+            self._size += 1
+            return
+
+        check_contains = bucket.contains(key)                       # determine if a key is present in the SLL
 
         if check_contains:
             check_contains.value = value                            # replace value if key is already present in map
         else:
-            self._buckets[bucket_index].insert(key, value)          # otherwise add key/value pair to corresponding
+            bucket.insert_node(self._node_type(key, value))         # otherwise add key/value pair to corresponding
             self._size += 1                                         # SLL in the map
+            if bucket.length() > self._FLOOD_CHAIN + 2 * self._size / self._capacity:
+                self._flooded = True
 
     def empty_buckets(self) -> int:
         """
@@ -74,10 +286,11 @@ class HashMap:
         in the map.
         """
         num_empty = 0                   # initialize count
+        epoch = self._epoch
 
         # iterate through the map, increase count if a bucket is empty
-        for bucket in range(self._buckets.length()):
-            if self._buckets[bucket].length() == 0:
+        for bucket, generation in zip(self._buckets.view(), self._generations.view()):
+            if generation != epoch or bucket is None:
                 num_empty += 1
         return num_empty
 
@@ -91,14 +304,11 @@ class HashMap:
 
     def clear(self) -> None:
         """
-        Method that clears the current HashMap. It does not take any parameters and does not change
-        the underlying capacity of the current map.
+        Method that clears the current HashMap in constant time. It does not take any parameters and
+        does not change the underlying capacity of the current map. Starting a new epoch makes every
+        bucket written before the clear read as empty; old chains are dropped lazily as buckets are reused.
         """
-        # iterate through current table, if an index contains any key/value pairs
-        # initialize an empty linked list to replace the current SLL
-        for bucket in range(self._buckets.length()):
-            if self._buckets[bucket].length() != 0:
-                self._buckets[bucket] = LinkedList()
+        self._epoch += 1                # buckets of older epochs read as empty
         self._size = 0
 
     def resize_table(self, new_capacity: int) -> None:
@@ -110,72 +320,112 @@ class HashMap:
         """
         if new_capacity < 1:
             return
+        self._rebuild(new_capacity, self._hash_function)
 
-        old_map = self._buckets
-
+    def _rebuild(self, new_capacity: int, function) -> None:
+        """
+        Rehash every pair into a table of new_capacity using function.
+        """
         # create new HashMap to rehash values of the current map with the new capacity
-        new_map = HashMap(new_capacity, self._hash_function)
-
-        # iterate through the old hash table, rehash values if SLL is not empty
-        for bucket in range(old_map.length()):
-            # if bucket contains a SLL with key/value pairs, iterate through and rehash as necessary
-            if old_map[bucket].length() != 0:
-                iterator = old_map[bucket].__iter__()
-                current_node = iterator.__next__()
-                while current_node is not None:
-                    new_map.put(current_node.key, current_node.value)
-                    current_node = current_node.next
+        new_map = self._table_class(new_capacity, function)
+
+        # iterate through the old hash table, rehash the pairs of every non-empty bucket
+        for current_node in self._live_nodes():
+            new_map._put_at(function(current_node.key) % new_capacity,
+                            current_node.key, current_node.value)
+        self._adopt(new_map)
 
+    def _adopt(self, new_map: "HashMap") -> None:
+        """
+        Take over the buckets, capacity and hash function of a rehashed copy of this map.
+        """
         # set values of the original HashMap to the rehashed values with the new capacity
+        self._hash_function = new_map._hash_function
+        self._bind_hash()
         self._buckets = new_map._buckets
-        self._capacity = new_capacity
+        self._generations = new_map._generations
+        self._epoch = new_map._epoch
+        self._frozen = False
+        self._capacity = new_map._capacity
 
+    def _check_flood(self) -> None:
+        """
+        Called after insertions, including each insertion of the bulk operations. If one of them
+        grew a chain more than _FLOOD_CHAIN pairs beyond twice the table load, which random keys
+        essentially never do, the keys are likely crafted to collide under the hash function (hash
+        flooding). A map created with a seed then switches to a new random seed and rehashes every
+        pair. To keep insertion amortized constant time, the map is only reseeded again once its
+        size has doubled. Maps hashing with the function they were given never change it, so their
+        layout and key order stay deterministic.
+        """
+        if not self._flooded:
+            return
+        self._flooded = False
+        if not self._keyed or self._size < 2 * self._reseed_size:
+            return
+        self._reseed_size = self._size
+        self._rebuild(self._capacity, seeded_hash_function(secrets.randbits(64)))
 
+    def _probe_length(self, key: object) -> int:
+        """
+        Return the length of the chain a lookup of key walks, for profiling.
+        """
+        bucket = self._bucket(self._hash(key) % self._capacity)
+        if bucket is None:
+            return 0
+        return bucket.length() if isinstance(bucket, LinkedList) else 1
 
-    def get(self, key: str) -> object:
+    def get(self, key: object) -> object:
         """
         Method that returns the value of a given key. Takes one parameter the key
         that is being searched for. If the key is not present in the hash table,
         the method returns None.
         """
-        bucket_index = self._hash_function(key) % self._capacity    # find index of given key
-        target = self._buckets[bucket_index].contains(key)
+        bucket_index = self._hash(key) % self._capacity             # find index of given key
+        target = self._find_node(bucket_index, key)
         if target:                                                  # if key is in the table
             return target.value
         else:
             return None
 
-
-    def contains_key(self, key: str) -> bool:
+    def contains_key(self, key: object) -> bool:
         """
         Method that determines if the current hash table contains a given key. The given key
         is run through the hash function, if it is present the method returns true, if it is
         not present it returns false.
         """
-        bucket_index = self._hash_function(key) % self._capacity    # determine index of given key
-        target = self._buckets[bucket_index].contains(key)          # determine if SLL contains given key
+        bucket_index = self._hash(key) % self._capacity             # determine index of given key
+        target = self._find_node(bucket_index, key)                 # determine if bucket contains given key
 
         if target:
             return True
         else:
             return False
 
-    def remove(self, key: str) -> None:
+    def remove(self, key: object) -> None:
         """
         Method that removes a key/value pair from the hash table. Takes one parameter
         the key to be removed. If the key is not found, the method does nothing. If the
         key is found, the key/value pair is removed and the size of the hash table is
         decremented.
         """
-        bucket_index = self._hash_function(key) % self._capacity
-        target = self._buckets[bucket_index].contains(key)
+        bucket_index = self._hash(key) % self._capacity
+        bucket = self._own(bucket_index)
 
-        if target:
-            self._buckets[bucket_index].remove(key)
-            self._size -= 1
-        else:
+        if bucket is None:
             return
 
+        if not isinstance(bucket, LinkedList):
+            if bucket.key is key or bucket.key == key:
+                self._buckets.view()[bucket_index] = None
+                self._size -= 1
+            return
+
+        if bucket.remove(key):
+            self._size -= 1
+            # a chain left with one pair goes back to being stored inline
+            if bucket.length() == 1:
+                self._buckets.view()[bucket_index] = next(iter(bucket))
 
     def get_keys(self) -> DynamicArray:
         """
@@ -185,16 +435,103 @@ class HashMap:
 
         key_array = DynamicArray()
 
-        for bucket in range(self._buckets.length()):
-            # if a bucket is not empty, append all keys to the new DA
-            if self._buckets[bucket].length() != 0:
-                iterator = self._buckets[bucket].__iter__()             # initialize iterator
-                current_node = iterator.__next__()
-                while current_node is not None:
-                    key_array.append(current_node.key)                  # append key to DA
-                    current_node = current_node.next
+        for current_node in self._live_nodes():
+            key_array.append(current_node.key)                      # append key to DA
         return key_array
 
+    def _live_nodes(self):
+        """
+        Yield the nodes of every bucket, in bucket order.
+        """
+        epoch = self._epoch
+        for bucket, generation in zip(self._buckets.view(), self._generations.view()):
+            # empty buckets are None and contribute no nodes
+            if generation == epoch and bucket is not None:
+                if isinstance(bucket, LinkedList):
+                    yield from bucket
+                else:
+                    yield bucket
+
+    def _same_layout(self, other) -> bool:
+        """
+        Return True if other is a separate chaining map with the same hash function and capacity,
+        so that each key sits in the bucket with the same index in both maps.
+        """
+        return (isinstance(other, HashMap) and other._hash_function is self._hash_function
+                and other._capacity == self._capacity)
+
+    def _merge_from(self, other, combine) -> None:
+        """
+        Put every pair of other into this map. With the same layout, bucket i of other is merged
+        straight into bucket i without hashing any key.
+        """
+        if self._same_layout(other):
+            pairs = ((bucket, current_node.key, current_node.value) for bucket in range(self._capacity)
+                     for current_node in self._bucket_nodes(other._bucket(bucket)))
+        else:
+            pairs = ((None, key, value) for key, value in other.items())
+
+        function = self._hash_function
+        for bucket, key, value in pairs:
+            # after a reseed the bucket indices of other no longer apply
+            if bucket is None or self._hash_function is not function:
+                bucket = self._hash(key) % self._capacity
+            self._put_at(bucket, key, value, combine)
+            if self._flooded:
+                self._check_flood()
+
+    def update(self, other) -> None:
+        """
+        Method that puts every key/value pair of another map into this one, replacing the values
+        of keys present in both. Like put, it never resizes the table. When other has the same
+        hash function and capacity, its buckets are merged index by index without rehashing.
+        """
+        self._merge_from(other, None)
+
+    def merge(self, other, combine) -> None:
+        """
+        Method that works like update, except that a key present in both maps gets the value
+        combine(value in this map, value in other).
+        """
+        self._merge_from(other, combine)
+
+    def diff(self, other) -> "HashMap":
+        """
+        Method that returns a new map, with the same hash function and capacity as this one,
+        holding the key/value pairs whose key is missing from other or maps to a different value
+        there. Keys keep their bucket index in the result, so they are only hashed to probe other,
+        and not at all if other has the same hash function and capacity.
+        """
+        result = self._table_class(self._capacity, self._hash_function, arena=self._arena)
+        same_layout = self._same_layout(other)
+
+        for bucket in range(self._capacity):
+            for current_node in self._bucket_nodes(self._bucket(bucket)):
+                if same_layout:
+                    match = other._find_node(bucket, current_node.key)
+                    differs = match is None or match.value != current_node.value
+                else:
+                    differs = (not other.contains_key(current_node.key)
+                               or other.get(current_node.key) != current_node.value)
+                if differs:
+                    result._put_at(bucket, current_node.key, current_node.value)
+        return result
+
+    def __iter__(self):
+        """
+        Iterate over the keys present in the hash table, in bucket order.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def items(self):
+        """
+        Method that iterates over the key/value pairs present in the hash table, in bucket order,
+        without copying them into a Dynamic Array first.
+        """
+        for current_node in self._live_nodes():
+            yield current_node.key, current_node.value
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
@@ -442,3 +779,79 @@ if __name__ == "__main__":
         map = HashMap(da.length() // 3, hash_function_2)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode: {mode}, Frequency: {frequency}\n")
+
+    print("\nPDF - snapshot example 1")
+    print("------------------------")
+    m = HashMap(20, hash_function_1)
+    for i in range(5):
+        m.put('key' + str(i), i * 10)
+    snap = m.snapshot()
+    m.put('key0', -1)
+    m.remove('key1')
+    m.put('key5', 50)
+    m.resize_table(100)
+    print(snap.get_size(), snap.get('key0'), snap.get('key1'), snap.contains_key('key5'))
+    print(m.get_size(), m.get('key0'), m.get('key1'), m.get('key5'), m.get_capacity())
+    snap.put('key9', 90)
+    print(snap.get_size(), snap.get('key9'), m.contains_key('key9'))
+
+    print("\nPDF - update example 1")
+    print("----------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(4):
+        m.put('key' + str(i), i)
+    other = HashMap.from_dict({'key1': 100, 'key7': 70}, hash_function_2)
+    m.update(other)
+    print(m.get_size(), m.get('key1'), m.get('key7'))
+    m.merge(other, lambda mine, theirs: mine + theirs)
+    print(m.get_size(), m.get('key1'), m.get('key7'))
+    print(sorted(m.diff(other).items()))
+
+    print("\nPDF - seed example 1")
+    print("--------------------")
+    # anagrams collide under hash_function_1, a seeded map hashes them with seeded_hash instead
+    first = HashMap(31, hash_function_1, seed=42)
+    second = HashMap(31, hash_function_1, seed=42)
+    for word in ['abc', 'acb', 'bac', 'bca', 'cab', 'cba']:
+        first.put(word, word.upper())
+        second.put(word, word.upper())
+    print(first.get_size(), first.get('bca'), list(first) == list(second))
+
+    print("\nPDF - arena example 1")
+    print("---------------------")
+    arena = KeyArena()
+    first = HashMap(10, hash_function_1, arena=arena)
+    second = HashMap(10, hash_function_1, arena=arena)
+    first.put(''.join(['sha', 'red']), 1)
+    second.put(''.join(['sha', 'red']), 2)
+    print(len(arena), 'shared' in arena, next(iter(first)) is next(iter(second)))
+
+    print("\nPDF - clear example 3")
+    print("---------------------")
+    # clear starts a new epoch instead of emptying the buckets, the old ones read as empty
+    m = HashMap(1000, hash_function_1)
+    for i in range(300):
+        m.put(i, i)
+    m.clear()
+    print(m.get_size(), m.get(5), m.empty_buckets(), m.get_capacity())
+    m.put(5, 'five')
+    print(m.get_size(), m.get(5), m.empty_buckets())
+
+    print("\nPDF - key types example 1")
+    print("-------------------------")
+    # keys comparing equal hash alike: numbers equal to an int, and dataclasses whatever the
+    # values of their compare=False fields
+    from dataclasses import dataclass, field
+    from decimal import Decimal
+
+    @dataclass(frozen=True)
+    class Point:
+        x: int
+        y: int
+        label: str = field(default='', compare=False)
+
+    m = HashMap(11, hash_function_2)
+    m.put(5, 'five')
+    m.put(Point(1, 2, 'first'), 'point')
+    m.put(Point(1, 2, 'second'), 'same point')
+    print(m.get_size(), m.get(Decimal(5)), m.get(5.0), m.get(Point(1, 2)), m.get(Decimal('5.5')))
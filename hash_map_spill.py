@@ -0,0 +1,551 @@
+# Description: This program implements SpillHashMap, a hash map for more pairs than fit in memory. Keys
+#              are split into partitions by the leading bits of their mixed hash through a directory, as
+#              in extendible hashing: a partition whose pairs outgrow a byte budget is split in two on
+#              the next hash bit, doubling the directory if needed, so no partition grows without bound.
+#              Only the max_resident most recently used partitions are kept in memory, tracked by an
+#              LRUCache; when a partition is evicted from it, its pairs are written in one sequential
+#              pickle dump to a base file of its own. Writes to a partition that is not in memory, while
+#              max_resident others are, are not applied to its file: they are buffered in memory, and
+#              once buffer_pairs writes are buffered in all, each partition's buffer is appended to a log
+#              file of its own. The next time the partition is read, its base file, log and buffer are
+#              merged into one table, and a log that grows larger than its base file is merged into it on
+#              the spot. Each partition keeps a Bloom filter of its keys in memory, so get and
+#              contains_key answer most misses on a spilled partition without reading its files. Keys and
+#              values must be picklable.
+
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from collections import namedtuple
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_1, hash_function_2, hash_int
+from hash_map_cache import LRUCache
+
+
+SpillStats = namedtuple('SpillStats', 'loads spills resident size appends splits partitions')
+
+
+class _Partition:
+    """
+    Pairs whose mixed hash starts with the same depth bits. In memory while resident, otherwise
+    stored as a base file, a log file of the writes appended since and a buffer of newer writes.
+    """
+
+    def __init__(self, number: int, depth: int) -> None:
+        """Initialize an empty partition, named number, for keys sharing depth leading bits."""
+        self.number = number
+        self.depth = depth
+        self.size = 0                   # number of pairs, None after writes whose effect is unknown
+        self.bytes = 0                  # estimated memory of the pairs once loaded
+        self.base_size = 0              # pairs in the base file
+        self.logged = 0                 # records in the log file
+        self.buffer = None              # HashMap of buffered writes, key -> (present, value)
+        self.dirty = False              # resident pairs changed since the base file was written
+        self.bloom_bits = 64
+        self.bloom = bytearray(self.bloom_bits // 8 + 1)
+
+
+class SpillHashMap:
+    _BLOOM_BITS_PER_KEY = 10            # Bloom filter bits per key, for twice the keys at the last write
+    _BLOOM_PROBES = 3                   # bits set per key
+    _PAIR_OVERHEAD = 100                # estimated bytes of a stored pair beyond its key and value
+    _MAX_DEPTH = 20                     # hash bits partitions may split on, bounding the directory
+    _MIN_COMPACT = 1000                 # log records below which a log is never merged into its base
+
+    def __init__(self, function, partition_bits: int = 4, max_resident: int = 4,
+                 directory: str = None, engine=hash_map_oa.HashMap, partition_bytes: int = 1 << 20,
+                 buffer_pairs: int = 10000) -> None:
+        """
+        Initialize new SpillHashMap with 2 ** partition_bits partitions, keeping at most
+        max_resident of them in memory in HashMaps built by engine. A partition is split once its
+        pairs are estimated to take more than partition_bytes in memory. Up to buffer_pairs writes
+        to partitions that are not in memory are buffered before being appended to their logs.
+        Spilled partitions are written to directory, a new temporary directory by default.
+        """
+        if not 0 <= partition_bits <= 16:
+            raise ValueError("partition_bits must be between 0 and 16")
+        if partition_bytes < 1 or buffer_pairs < 1:
+            raise ValueError("partition_bytes and buffer_pairs must be at least 1")
+        self._hash_function = function
+        self._engine = engine
+        self._partition_bits = partition_bits
+        self._partition_bytes = partition_bytes
+        self._buffer_pairs = buffer_pairs
+        self._max_resident = max_resident
+
+        self._own_directory = directory is None
+        self._directory = tempfile.mkdtemp(prefix='spill-') if directory is None else directory
+        self._resident = LRUCache(hash_function_2, max_entries=max_resident,
+                                  on_evict=self._spill, capacity=2 * max_resident + 1)
+        self._next_number = 0
+        self._reset()
+
+        self._loads = 0
+        self._spills = 0
+        self._appends = 0
+        self._splits = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'SpillHashMap ' + str(self.stats())
+
+    def __enter__(self) -> "SpillHashMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_size(self) -> int:
+        """
+        Return size of map. A spilled partition took writes whose effect is unknown when they may
+        have replaced or removed a key in its files; it is compacted first, reading its files once.
+        """
+        for partition in list(self._partitions.values()):
+            if partition.size is None:
+                self._compact(partition)
+        return sum(partition.size for partition in self._partitions.values())
+
+    def stats(self) -> SpillStats:
+        """
+        Return the number of partition loads and spills so far, the number of resident
+        partitions, the size of the map, the number of buffers appended to logs, the number of
+        partition splits and the number of partitions
+        """
+        return SpillStats(self._loads, self._spills, self._resident.get_size(), self.get_size(),
+                          self._appends, self._splits, len(self._partitions))
+
+    # ------------------------------------------------------------------ #
+
+    def _reset(self) -> None:
+        """Start over with empty partitions, one per value of the first partition_bits bits."""
+        self._depth = self._partition_bits                  # leading hash bits indexing the directory
+        self._table = [self._new_partition(self._depth) for _ in range(1 << self._depth)]
+        self._partitions = {partition.number: partition for partition in self._table}
+        self._buffered = 0                                  # writes in all buffers
+
+    def _new_partition(self, depth: int) -> _Partition:
+        """Return a new empty partition with a number of its own."""
+        self._next_number += 1
+        return _Partition(self._next_number, depth)
+
+    def _mix(self, key: object) -> int:
+        """Return the mixed 64 bit hash of key."""
+        return hash_int(self._hash_function(key))
+
+    def _locate(self, key: object) -> (_Partition, int):
+        """
+        Return the partition of key, from the leading bits of its mixed hash, and the mixed hash.
+        """
+        mixed = self._mix(key)
+        return self._table[mixed >> (64 - self._depth)], mixed
+
+    def _pair_bytes(self, key: object, value: object) -> int:
+        """Return the estimated memory of a stored pair."""
+        return sys.getsizeof(key) + sys.getsizeof(value) + self._PAIR_OVERHEAD
+
+    def _bloom_positions(self, partition: _Partition, mixed: int) -> list:
+        """Return the Bloom filter bits of a key, by double hashing on its mixed hash."""
+        step = (mixed >> 32) | 1
+        return [(mixed + probe * step) % partition.bloom_bits for probe in range(self._BLOOM_PROBES)]
+
+    def _bloom_add(self, partition: _Partition, mixed: int) -> None:
+        """Record a key in the Bloom filter of its partition."""
+        bloom = partition.bloom
+        for bit in self._bloom_positions(partition, mixed):
+            bloom[bit >> 3] |= 1 << (bit & 7)
+
+    def _may_contain(self, partition: _Partition, mixed: int) -> bool:
+        """Return False if the key is certainly not in the files or buffer of the partition."""
+        bloom = partition.bloom
+        return all(bloom[bit >> 3] & (1 << (bit & 7)) for bit in self._bloom_positions(partition, mixed))
+
+    def _path(self, partition: _Partition, extension: str) -> str:
+        """Return the base ('pkl') or log ('log') file of a partition."""
+        return os.path.join(self._directory, 'partition-' + str(partition.number) + '.' + extension)
+
+    def _read_base(self, partition: _Partition) -> list:
+        """Read the pairs of the base file of a partition with one sequential load."""
+        if partition.base_size == 0:
+            return []
+        with open(self._path(partition, 'pkl'), 'rb') as file:
+            return pickle.load(file)
+
+    def _records(self, partition: _Partition):
+        """
+        Yield the writes made to a partition since its base file was written, as (key, present,
+        value), oldest first: the batches appended to its log, then its buffer.
+        """
+        if partition.logged:
+            with open(self._path(partition, 'log'), 'rb') as file:
+                while True:
+                    try:
+                        batch = pickle.load(file)
+                    except EOFError:
+                        break
+                    yield from batch
+        if partition.buffer is not None:
+            for key, (present, value) in partition.buffer.items():
+                yield key, present, value
+
+    def _put_into(self, table, key: object, value: object) -> None:
+        """Put a pair into a partition table, growing separate chaining tables, which do not grow on their own."""
+        table.put(key, value)
+        if table.table_load() > 1:
+            table.resize_table(table.get_capacity() * 2)
+
+    def _merged(self, partition: _Partition):
+        """
+        Return a new table holding the pairs of a partition that is not resident, merging its base
+        file, log and buffer. The partition is left unchanged.
+        """
+        items = self._read_base(partition)
+        table = self._engine.from_items(items, self._hash_function, len(items))
+        for key, present, value in self._records(partition):
+            if present:
+                self._put_into(table, key, value)
+            else:
+                table.remove(key)
+        return table
+
+    def _drop_writes(self, partition: _Partition) -> None:
+        """Forget the log and buffer of a partition once they are merged into a table."""
+        if partition.logged:
+            os.remove(self._path(partition, 'log'))
+            partition.logged = 0
+        if partition.buffer is not None:
+            self._buffered -= partition.buffer.get_size()
+            partition.buffer = None
+
+    def _settle(self, partition: _Partition, table) -> None:
+        """Take the exact size and memory estimate of a partition from its merged table."""
+        partition.size = table.get_size()
+        partition.bytes = sum(self._pair_bytes(key, value) for key, value in table.items())
+
+    def _load(self, partition: _Partition):
+        """
+        Return the table of a partition, merging its files and buffer into a new resident table if
+        it was spilled. Making it resident may spill the least recently used resident partition.
+        """
+        table = self._resident.get(partition.number)
+        if table is not None:
+            return table
+
+        changed = partition.logged > 0 or partition.buffer is not None
+        if partition.base_size or partition.logged:
+            self._loads += 1
+        table = self._merged(partition)
+        self._drop_writes(partition)
+        self._settle(partition, table)
+        partition.dirty = changed                   # the base file lacks the merged writes
+        self._resident.put(partition.number, table)
+        return table
+
+    def _write(self, partition: _Partition, table) -> None:
+        """
+        Write the pairs of table to the base file of a partition with one sequential dump and
+        rebuild its Bloom filter from them, dropping bits of removed keys.
+        """
+        items = list(table.items())
+        if items:
+            with open(self._path(partition, 'pkl'), 'wb') as file:
+                pickle.dump(items, file, pickle.HIGHEST_PROTOCOL)
+            self._spills += 1
+        elif partition.base_size:
+            os.remove(self._path(partition, 'pkl'))
+        partition.base_size = len(items)
+        partition.dirty = False
+
+        partition.bloom_bits = self._BLOOM_BITS_PER_KEY * max(8, 2 * len(items))
+        partition.bloom = bytearray(partition.bloom_bits // 8 + 1)
+        for key, _ in items:
+            self._bloom_add(partition, self._mix(key))
+
+    def _spill(self, number: int, table) -> None:
+        """
+        Eviction callback of the resident partitions. Writes a changed partition to its base file.
+        """
+        partition = self._partitions[number]
+        if partition.dirty:
+            self._write(partition, table)
+
+    def _compact(self, partition: _Partition) -> None:
+        """
+        Merge the log and buffer of a partition that is not resident into its base file, splitting
+        the partition if its pairs outgrew the byte budget.
+        """
+        table = self._merged(partition)
+        self._drop_writes(partition)
+        self._settle(partition, table)
+        self._split(partition, table)
+
+    def _split(self, partition: _Partition, table) -> None:
+        """
+        Write a partition that is not resident, holding the pairs of table, to disk. While its
+        pairs take more than the byte budget, it is first replaced by two partitions one hash bit
+        deeper, and so on for each of them, until _MAX_DEPTH bits.
+        """
+        pending = [(partition, table)]
+        while pending:
+            partition, table = pending.pop()
+            if partition.bytes <= self._partition_bytes or partition.depth >= self._MAX_DEPTH:
+                self._write(partition, table)
+                continue
+
+            halves = (self._new_partition(partition.depth + 1), self._new_partition(partition.depth + 1))
+            items = ([], [])
+            shift = 63 - partition.depth                    # the first hash bit the keys may differ in
+            for key, value in table.items():
+                items[(self._mix(key) >> shift) & 1].append((key, value))
+            for half, half_items in zip(halves, items):
+                half_table = self._engine.from_items(half_items, self._hash_function, len(half_items))
+                self._settle(half, half_table)
+                pending.append((half, half_table))
+            self._replace(partition, halves)
+
+    def _replace(self, partition: _Partition, halves: tuple) -> None:
+        """
+        Point the directory entries of a partition at the two partitions it was split into, by the
+        next hash bit, doubling the directory first if the partition used all of its bits.
+        """
+        if partition.depth == self._depth:
+            self._table = [entry for entry in self._table for _ in range(2)]
+            self._depth += 1
+        shift = self._depth - partition.depth - 1
+        for index, entry in enumerate(self._table):
+            if entry is partition:
+                self._table[index] = halves[(index >> shift) & 1]
+
+        if partition.base_size:
+            os.remove(self._path(partition, 'pkl'))
+        del self._partitions[partition.number]
+        for half in halves:
+            self._partitions[half.number] = half
+        self._splits += 1
+
+    def _buffer(self, partition: _Partition, mixed: int, key: object, present: bool,
+                value: object) -> None:
+        """
+        Record a write to a partition that is not resident in its buffer: a put if present,
+        otherwise a removal. The size of the partition stays exact while the write is known to
+        add or remove a key, from the buffer or because the Bloom filter rules the key out.
+        """
+        buffer = partition.buffer
+        if buffer is None:
+            buffer = partition.buffer = hash_map_oa.HashMap(17, self._hash_function)
+        record = buffer.get(key)
+
+        if record is not None:
+            was_present = record[0]                         # the last write to the key is buffered
+        elif partition.size is not None and not self._may_contain(partition, mixed):
+            was_present = False
+        else:
+            was_present = None                              # the key may be in the files
+        if was_present is None:
+            partition.size = None
+        elif partition.size is not None:
+            partition.size += present - was_present
+
+        if present:
+            self._bloom_add(partition, mixed)
+            if not was_present:
+                partition.bytes += self._pair_bytes(key, value)
+        elif was_present:
+            partition.bytes -= self._pair_bytes(key, record[1])
+
+        buffer.put(key, (present, value))
+        if record is None:
+            self._buffered += 1
+            if self._buffered > self._buffer_pairs:
+                self._flush()
+
+    def _flush(self) -> None:
+        """
+        Append every buffer to the log of its partition, one batch per partition. A log that grows
+        past the base file, or a partition past the byte budget, is compacted.
+        """
+        for partition in list(self._partitions.values()):
+            if partition.buffer is None:
+                continue
+            records = [(key, present, value) for key, (present, value) in partition.buffer.items()]
+            with open(self._path(partition, 'log'), 'ab') as file:
+                pickle.dump(records, file, pickle.HIGHEST_PROTOCOL)
+            self._appends += 1
+            partition.logged += len(records)
+            partition.buffer = None
+
+            if (partition.logged > max(self._MIN_COMPACT, partition.base_size)
+                    or partition.bytes > self._partition_bytes):
+                self._compact(partition)
+        self._buffered = 0
+
+    def put(self, key: object, value: object) -> None:
+        """
+        Method that updates the value of key, or adds the key/value pair if the key is not present.
+        The write goes to the partition's table if it is resident, or if it can be made resident
+        without evicting another partition, and to its buffer otherwise.
+        """
+        partition, mixed = self._locate(key)
+        table = self._resident.get(partition.number)
+        if table is None:
+            if self._resident.get_size() >= self._max_resident:
+                self._buffer(partition, mixed, key, True, value)
+                return
+            table = self._load(partition)
+
+        size = table.get_size()
+        self._put_into(table, key, value)
+        if table.get_size() > size:
+            partition.size += 1
+            partition.bytes += self._pair_bytes(key, value)
+        partition.dirty = True
+
+        if partition.bytes > self._partition_bytes and partition.depth < self._MAX_DEPTH:
+            self._resident.remove(partition.number)
+            self._split(partition, table)
+
+    def get(self, key: object) -> object:
+        """
+        Method that returns the value of key, or None if the key is not present. A spilled
+        partition is only loaded if the key is not in its buffer and its Bloom filter says the
+        key may be in its files.
+        """
+        partition, mixed = self._locate(key)
+        table = self._resident.get(partition.number)
+        if table is None:
+            record = partition.buffer.get(key) if partition.buffer is not None else None
+            if record is not None:
+                return record[1] if record[0] else None
+            if partition.size == 0 or not self._may_contain(partition, mixed):
+                return None
+            table = self._load(partition)
+        return table.get(key)
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Method that determines if key is present in the map.
+        """
+        partition, mixed = self._locate(key)
+        table = self._resident.get(partition.number)
+        if table is None:
+            record = partition.buffer.get(key) if partition.buffer is not None else None
+            if record is not None:
+                return record[0]
+            if partition.size == 0 or not self._may_contain(partition, mixed):
+                return False
+            table = self._load(partition)
+        return table.contains_key(key)
+
+    def remove(self, key: object) -> None:
+        """
+        Method that removes key and its value. Does nothing if the key is not present. The removal
+        is buffered if the partition is not resident and the key may be in it.
+        """
+        partition, mixed = self._locate(key)
+        table = self._resident.get(partition.number)
+        if table is None:
+            buffered = partition.buffer is not None and partition.buffer.contains_key(key)
+            if buffered or (partition.size != 0 and self._may_contain(partition, mixed)):
+                self._buffer(partition, mixed, key, False, None)
+            return
+
+        if table.contains_key(key):
+            partition.bytes -= self._pair_bytes(key, table.get(key))
+            table.remove(key)
+            partition.size -= 1
+            partition.dirty = True
+
+    def clear(self) -> None:
+        """
+        Method that removes every pair, dropping the resident partitions and the spill files.
+        """
+        self._resident.clear()
+        for partition in self._partitions.values():
+            if partition.base_size:
+                os.remove(self._path(partition, 'pkl'))
+            if partition.logged:
+                os.remove(self._path(partition, 'log'))
+        self._reset()
+
+    def close(self) -> None:
+        """
+        Method that clears the map and removes the spill directory if the map created it.
+        """
+        self.clear()
+        if self._own_directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+    def items(self):
+        """
+        Method that iterates over the key/value pairs, partition by partition. Spilled partitions
+        are merged from their files and buffers without being made resident.
+        """
+        previous = None
+        for partition in self._table:
+            if partition is previous:
+                continue                                    # the entries of a partition are adjacent
+            previous = partition
+            table = self._resident.get(partition.number)
+            if table is None:
+                table = self._merged(partition)
+            yield from table.items()
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the map
+        """
+        for key, _ in self.items():
+            yield key
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Method that returns a Dynamic Array with the keys of the map.
+        """
+        key_array = DynamicArray()
+        for key in self:
+            key_array.append(key)
+        return key_array
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nSpillHashMap - put example 1")
+    print("----------------------------")
+    with SpillHashMap(hash_function_2, partition_bits=3, max_resident=2) as m:
+        for i in range(2000):
+            m.put('key' + str(i), i)
+        print(m.get_size(), m.get('key17'), m.get('key1999'), m.get('missing'),
+              m.contains_key('key500'))
+        m.remove('key17')
+        print(m.get('key17'), m.get_size(), sum(value for _, value in m.items()),
+              m.stats().resident)
+
+    print("\nSpillHashMap - mode example 1")
+    print("-----------------------------")
+    with SpillHashMap(hash_function_1, partition_bits=2, max_resident=1,
+                      engine=hash_map_sc.HashMap) as m:
+        for word in ["Arch", "Manjaro", "Manjaro", "Mint", "Mint", "Mint", "Ubuntu"] * 3:
+            m.put(word, (m.get(word) or 0) + 1)
+        counts = sorted(m.items(), key=lambda pair: (-pair[1], pair[0]))
+        print(counts[0], m.get_size())
+
+    print("\nSpillHashMap - split example 1")
+    print("------------------------------")
+    # a small byte budget splits the partitions as they fill, and small buffers go to the logs
+    with SpillHashMap(hash_function_2, partition_bits=1, max_resident=2,
+                      partition_bytes=20000, buffer_pairs=100) as m:
+        for i in range(3000):
+            m.put(i, str(i))
+        for i in range(0, 3000, 3):
+            m.remove(i)
+        stats = m.stats()
+        print(m.get_size(), m.get(1), m.get(3), stats.partitions > 2, stats.splits > 0,
+              stats.appends > 0)
@@ -0,0 +1,348 @@
+# Description: This program implements HashSet and HashMultiset on top of the HashMap implementations.
+#              HashSet stores its keys in an open addressing or separate chaining table whose entries
+#              (KeyEntry / KeyNode) have no value slot at all. HashMultiset stores the number of copies
+#              of each key as the value of a regular HashMap. Both support add, discard, membership
+#              tests with the in operator, bulk update and the union, intersection and difference
+#              operations, which iterate the smaller operand and probe the larger one where they can.
+
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import KeyEntry, KeyNode, hash_function_1, hash_function_2
+
+
+class _OASetTable(hash_map_oa.HashMap):
+    """
+    Open addressing table storing keys only
+    """
+    _entry_type = KeyEntry
+
+
+class _SCSetTable(hash_map_sc.HashMap):
+    """
+    Separate chaining table storing keys only
+    """
+    _node_type = KeyNode
+
+
+_SET_TABLES = {hash_map_oa.HashMap: _OASetTable, hash_map_sc.HashMap: _SCSetTable}
+
+
+def _capacity_for(engine, size: int) -> int:
+    """Return a table capacity that holds size keys without resizing in the given engine."""
+    if issubclass(engine, hash_map_oa.HashMap):
+        return 2 * size + 1
+    return max(size, 1)
+
+
+class HashSet:
+    def __init__(self, capacity: int, function, engine=hash_map_oa.HashMap) -> None:
+        """
+        Initialize new HashSet storing its keys in a table of the given
+        engine (the open addressing or the separate chaining HashMap)
+        """
+        self._table = _SET_TABLES[engine](capacity, function)
+        self._engine = engine
+        self._function = function
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'HashSet {' + ', '.join(str(key) for key in self) + '}'
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the set
+        """
+        return iter(self._table)
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Return True if key is in the set
+        """
+        return self._table.contains_key(key)
+
+    def __len__(self) -> int:
+        """
+        Return number of keys in the set
+        """
+        return self._table.get_size()
+
+    def get_size(self) -> int:
+        """
+        Return number of keys in the set
+        """
+        return self._table.get_size()
+
+    def _new(self, size: int) -> "HashSet":
+        """
+        Return an empty set with the same engine and hash function, sized to hold size keys.
+        """
+        return HashSet(_capacity_for(self._engine, size), self._function, self._engine)
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, key: object) -> None:
+        """
+        Method that adds key to the set. Does nothing if the key is already present.
+        """
+        self._table.put(key, None)
+
+    def discard(self, key: object) -> None:
+        """
+        Method that removes key from the set. Does nothing if the key is not present.
+        """
+        self._table.remove(key)
+
+    def clear(self) -> None:
+        """
+        Method that removes every key from the set.
+        """
+        self._table.clear()
+
+    def update(self, keys) -> None:
+        """
+        Method that adds every key of an iterable to the set. If the number of keys is known
+        the table is grown once up front instead of while adding.
+        """
+        if hasattr(keys, '__len__'):
+            needed = _capacity_for(self._engine, self.get_size() + len(keys))
+            if needed > self._table.get_capacity():
+                self._table.resize_table(needed)
+        for key in keys:
+            self._table.put(key, None)
+
+    def copy(self) -> "HashSet":
+        """
+        Method that returns a new set holding the same keys.
+        """
+        result = self._new(self.get_size())
+        for key in self:
+            result._table.put(key, None)
+        return result
+
+    def union(self, other: "HashSet") -> "HashSet":
+        """
+        Method that returns a new set with the keys that are in either set. The larger
+        set is copied and the keys of the smaller one are added to the copy.
+        """
+        small, large = (self, other) if self.get_size() <= other.get_size() else (other, self)
+        result = self._new(self.get_size() + other.get_size())
+        for key in large:
+            result._table.put(key, None)
+        for key in small:
+            result._table.put(key, None)
+        return result
+
+    def intersection(self, other: "HashSet") -> "HashSet":
+        """
+        Method that returns a new set with the keys that are in both sets, found by
+        probing the larger set with every key of the smaller one.
+        """
+        small, large = (self, other) if self.get_size() <= other.get_size() else (other, self)
+        result = self._new(small.get_size())
+        for key in small:
+            if key in large:
+                result._table.put(key, None)
+        return result
+
+    def difference(self, other: "HashSet") -> "HashSet":
+        """
+        Method that returns a new set with the keys of this set that are not in other. If other is
+        the smaller set, this set is copied and the keys of other are discarded from the copy;
+        otherwise every key of this set is probed in other.
+        """
+        if other.get_size() < self.get_size():
+            result = self.copy()
+            for key in other:
+                result._table.remove(key)
+            return result
+
+        result = self._new(self.get_size())
+        for key in self:
+            if key not in other:
+                result._table.put(key, None)
+        return result
+
+
+class HashMultiset:
+    def __init__(self, capacity: int, function, engine=hash_map_oa.HashMap) -> None:
+        """
+        Initialize new HashMultiset storing the count of each key as its
+        value in a HashMap of the given engine
+        """
+        self._table = engine(capacity, function)
+        self._engine = engine
+        self._function = function
+        self._total = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'HashMultiset {' + ', '.join(str(key) + ': ' + str(count)
+                                            for key, count in self.items()) + '}'
+
+    def __iter__(self):
+        """
+        Iterate over the distinct keys of the multiset
+        """
+        return iter(self._table)
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Return True if at least one copy of key is in the multiset
+        """
+        return self._table.contains_key(key)
+
+    def __len__(self) -> int:
+        """
+        Return number of distinct keys in the multiset
+        """
+        return self._table.get_size()
+
+    def get_size(self) -> int:
+        """
+        Return number of distinct keys in the multiset
+        """
+        return self._table.get_size()
+
+    def total(self) -> int:
+        """
+        Return number of copies of all keys in the multiset
+        """
+        return self._total
+
+    def items(self):
+        """
+        Iterate over the (key, count) pairs of the multiset
+        """
+        return self._table.items()
+
+    def _new(self, size: int) -> "HashMultiset":
+        """
+        Return an empty multiset with the same engine and hash function, sized to hold size keys.
+        """
+        return HashMultiset(_capacity_for(self._engine, size), self._function, self._engine)
+
+    # ------------------------------------------------------------------ #
+
+    def count(self, key: object) -> int:
+        """
+        Method that returns the number of copies of key in the multiset.
+        """
+        count = self._table.get(key)
+        return 0 if count is None else count
+
+    def add(self, key: object, count: int = 1) -> None:
+        """
+        Method that adds count copies of key to the multiset.
+        """
+        if count < 1:
+            return
+        self._table.put(key, self.count(key) + count)
+        self._total += count
+
+    def discard(self, key: object, count: int = 1) -> None:
+        """
+        Method that removes up to count copies of key, dropping the key once no copies are left.
+        """
+        current = self.count(key)
+        if current == 0 or count < 1:
+            return
+        if count >= current:
+            self._table.remove(key)
+            self._total -= current
+        else:
+            self._table.put(key, current - count)
+            self._total -= count
+
+    def clear(self) -> None:
+        """
+        Method that removes every key from the multiset.
+        """
+        self._table.clear()
+        self._total = 0
+
+    def update(self, keys) -> None:
+        """
+        Method that adds one copy of every key of an iterable to the multiset.
+        """
+        for key in keys:
+            self.add(key)
+
+    def most_common(self) -> (list, int):
+        """
+        Method that returns the keys with the highest count and that count.
+        """
+        modes, highest = [], 0
+        for key, count in self.items():
+            if count > highest:
+                modes, highest = [key], count
+            elif count == highest:
+                modes.append(key)
+        return modes, highest
+
+    def union(self, other: "HashMultiset") -> "HashMultiset":
+        """
+        Method that returns a new multiset holding each key with the larger of its two counts.
+        """
+        small, large = (self, other) if self.get_size() <= other.get_size() else (other, self)
+        result = self._new(self.get_size() + other.get_size())
+        for key, count in large.items():
+            result.add(key, count)
+        for key, count in small.items():
+            extra = count - result.count(key)
+            if extra > 0:
+                result.add(key, extra)
+        return result
+
+    def intersection(self, other: "HashMultiset") -> "HashMultiset":
+        """
+        Method that returns a new multiset holding the keys of both multisets with the smaller
+        of their two counts, found by probing the larger multiset with the smaller one's keys.
+        """
+        small, large = (self, other) if self.get_size() <= other.get_size() else (other, self)
+        result = self._new(small.get_size())
+        for key, count in small.items():
+            result.add(key, min(count, large.count(key)))
+        return result
+
+    def difference(self, other: "HashMultiset") -> "HashMultiset":
+        """
+        Method that returns a new multiset holding the counts of this multiset minus those
+        of other, keeping only the keys left with a positive count.
+        """
+        result = self._new(self.get_size())
+        for key, count in self.items():
+            result.add(key, count - other.count(key))
+        return result
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nHashSet - algebra example 1")
+    print("---------------------------")
+    for engine in (hash_map_oa.HashMap, hash_map_sc.HashMap):
+        a = HashSet(10, hash_function_2, engine)
+        b = HashSet(10, hash_function_2, engine)
+        a.update(['apple', 'grape', 'melon', 'peach'])
+        b.update(['melon', 'peach', 'lemon'])
+        a.discard('grape')
+        print(len(a), 'apple' in a, 'grape' in a,
+              sorted(a.union(b)), sorted(a.intersection(b)), sorted(a.difference(b)))
+
+    print("\nHashMultiset - count example 1")
+    print("------------------------------")
+    for engine in (hash_map_oa.HashMap, hash_map_sc.HashMap):
+        m = HashMultiset(10, hash_function_1, engine)
+        m.update(["Arch", "Manjaro", "Manjaro", "Mint", "Mint", "Mint"])
+        other = HashMultiset(10, hash_function_1, engine)
+        other.update(["Mint", "Arch", "Arch", "Ubuntu"])
+        m.discard("Manjaro")
+        print(m.count("Mint"), m.total(), len(m), m.most_common(),
+              sorted(m.union(other).items()), sorted(m.intersection(other).items()),
+              sorted(m.difference(other).items()))